@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.backup import create_backups
+from avtomat_aws.services import backup
 
 ACTION_DESCRIPTION = "Start an on-demand backup job for the specified resources."
 
@@ -49,7 +49,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = create_backups(**inputs)
+        result = backup.create_backups(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
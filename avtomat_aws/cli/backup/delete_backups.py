@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.backup import delete_backups
+from avtomat_aws.services import backup
 
 ACTION_DESCRIPTION = "Delete backup recovery points."
 
@@ -28,7 +28,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = delete_backups(**inputs)
+        result = backup.delete_backups(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
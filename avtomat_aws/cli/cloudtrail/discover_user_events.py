@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.cloudtrail import discover_user_events
+from avtomat_aws.services import cloudtrail
 
 ACTION_DESCRIPTION = "Discover events created by specific user."
 
@@ -36,7 +36,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_user_events(**inputs)
+        result = cloudtrail.discover_user_events(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
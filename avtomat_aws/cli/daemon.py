@@ -0,0 +1,320 @@
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+COMMANDS = ["start", "stop", "status"]
+ENVIRONMENT_PREFIX = "AWS_"
+BUFFER_SIZE = 65536
+
+
+def socket_path():
+    """Return the daemon socket path in a directory private to the user, overridable with AAWS_SOCKET."""
+
+    if os.environ.get("AAWS_SOCKET"):
+        return os.environ["AAWS_SOCKET"]
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(base, f"aaws-{os.getuid()}", "daemon.sock")
+
+
+def is_private(path, file_type):
+    """Check that a path is of a type, owned by the user and inaccessible to group and others."""
+
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+
+    return (
+        file_type(info.st_mode)
+        and info.st_uid == os.getuid()
+        and not info.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+    )
+
+
+def set_socket_directory(path):
+    """Create the socket's directory private to the user, refuse one anybody else controls."""
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not is_private(directory, stat.S_ISDIR):
+        raise PermissionError(f"{directory} must be a directory only you can access")
+
+
+def peer_uid(connection):
+    """Return the user ID of the other end of a connection, None where the platform can't tell."""
+
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = connection.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid
+
+
+def connect():
+    """Connect to a running daemon, return None if there isn't one the user owns."""
+
+    path = socket_path()
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    # Credentials are sent to the daemon, so it must be the user's own
+    if not is_private(os.path.dirname(path), stat.S_ISDIR) or not is_private(
+        path, stat.S_ISSOCK
+    ):
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+        if peer_uid(connection) not in (None, os.getuid()):
+            raise PermissionError(f"{path} is served by another user")
+    except OSError:
+        connection.close()
+        return None
+
+    return connection
+
+
+def send(connection, message):
+    """Send a message as a JSON line."""
+
+    connection.sendall(json.dumps(message).encode() + b"\n")
+
+
+def receive(connection):
+    """Yield JSON line messages until the connection closes."""
+
+    buffer = b""
+    while True:
+        chunk = connection.recv(BUFFER_SIZE)
+        if not chunk:
+            return
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            yield json.loads(line)
+
+
+def forward(argv):
+    """Run a command on the daemon and stream its output, return the exit code or None without a daemon.
+
+    Commands are only forwarded when AAWS_DAEMON is set, the daemon runs them one at a time.
+    """
+
+    if not os.environ.get("AAWS_DAEMON"):
+        return None
+
+    connection = connect()
+    if not connection:
+        return None
+
+    # The daemon resolves credentials and region as this shell would
+    environment = {
+        key: value
+        for key, value in os.environ.items()
+        if key.startswith(ENVIRONMENT_PREFIX)
+    }
+    with connection:
+        send(
+            connection,
+            {
+                "command": "run",
+                "argv": argv,
+                "environment": environment,
+                "cwd": os.getcwd(),
+            },
+        )
+        for message in receive(connection):
+            if "exit" in message:
+                return message["exit"]
+            stream = sys.stdout if message["stream"] == "stdout" else sys.stderr
+            stream.write(message["data"])
+            stream.flush()
+
+    sys.stderr.write("Error: Daemon closed the connection\n")
+    return 1
+
+
+class StreamWriter:
+    """File-like object forwarding writes to the client."""
+
+    def __init__(self, connection, stream):
+        self.connection = connection
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def write(self, data):
+        # Actions write from worker threads, messages must not interleave on the socket
+        if data:
+            with self.lock:
+                send(self.connection, {"stream": self.stream, "data": data})
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def run_command(connection, request):
+    """Run a forwarded command with the client's environment, working directory and output streams."""
+
+    import contextlib
+
+    from .main import parse_arguments, set_parser
+
+    environment = dict(os.environ)
+    cwd = os.getcwd()
+    os.environ.update(request["environment"])
+    for key in list(os.environ):
+        if key.startswith(ENVIRONMENT_PREFIX) and key not in request["environment"]:
+            del os.environ[key]
+
+    code = 0
+    stdout = StreamWriter(connection, "stdout")
+    stderr = StreamWriter(connection, "stderr")
+    try:
+        os.chdir(request["cwd"])
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                service, action = request["argv"][:2]
+                parser = set_parser(service, action)
+                args = parse_arguments(parser, request["argv"][2:])
+                args.func(args)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                print(f"Action failed - {e}", file=sys.stderr)
+                code = 1
+    finally:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(environment)
+
+    send(connection, {"exit": code})
+
+
+def serve():
+    """Serve commands on the daemon socket until stopped, one at a time."""
+
+    # Warm imports, botocore models and the session and client caches live as long as the daemon
+    from importlib import import_module
+
+    from avtomat_aws.helpers.set_session_objects import pool_stats
+
+    from .services import SERVICES
+
+    for service in SERVICES:
+        package = import_module(f"avtomat_aws.services.{service}")
+        for action in package.__all__:
+            getattr(package, action)
+
+    path = socket_path()
+    try:
+        set_socket_directory(path)
+    except OSError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(1)
+    connection = connect()
+    if connection:
+        connection.close()
+        sys.stderr.write(f"Error: Daemon already running on {path}\n")
+        sys.exit(1)
+    if os.path.lexists(path):
+        os.remove(path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Sessions hold credentials, so only the owner may connect
+    previous = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(previous)
+    server.listen()
+
+    started = time.time()
+    served = 0
+    print(f"Daemon listening on {path}")
+
+    try:
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                if peer_uid(connection) not in (None, os.getuid()):
+                    sys.stderr.write("Error: Dropped request from another user\n")
+                    continue
+                try:
+                    request = next(receive(connection))
+                    if request["command"] == "stop":
+                        send(connection, {"exit": 0})
+                        break
+                    if request["command"] == "status":
+                        status = {
+                            "pid": os.getpid(),
+                            "uptime": round(time.time() - started),
+                            "served": served,
+                            "pool": pool_stats(),
+                        }
+                        send(connection, {"stream": "stdout", "data": f"{status}\n"})
+                        send(connection, {"exit": 0})
+                        continue
+                    run_command(connection, request)
+                    served += 1
+                except (OSError, StopIteration, ValueError, KeyError) as e:
+                    sys.stderr.write(f"Error: Dropped request - {e}\n")
+    finally:
+        server.close()
+        os.remove(path)
+
+    print("Daemon stopped")
+
+
+def display_daemon_help():
+    """Displays help for the daemon command."""
+    print("usage: aaws daemon <command>\n")
+    print("Keep sessions, clients and imports warm in a local daemon.")
+    print(
+        "With AAWS_DAEMON=1 set, aaws commands are forwarded to it over a Unix socket."
+    )
+    print(
+        "The daemon runs commands one at a time, parallel commands wait for their turn.\n"
+    )
+    print("commands:")
+    print("    start                 Run the daemon in the foreground.")
+    print("    stop                  Stop the running daemon.")
+    print("    status                Show the running daemon's status.")
+
+
+def daemon_cli(argv):
+    """Manage the daemon."""
+
+    if len(argv) != 1 or argv[0] not in COMMANDS:
+        display_daemon_help()
+        sys.exit(0 if argv and argv[0] in ["--help", "-h"] else 1)
+
+    if not hasattr(socket, "AF_UNIX"):
+        sys.stderr.write("Error: The daemon requires Unix sockets\n")
+        sys.exit(1)
+
+    if argv[0] == "start":
+        serve()
+        sys.exit(0)
+
+    connection = connect()
+    if not connection:
+        sys.stderr.write("Error: Daemon is not running\n")
+        sys.exit(1)
+    with connection:
+        send(connection, {"command": argv[0]})
+        for message in receive(connection):
+            if "exit" in message:
+                sys.exit(message["exit"])
+            sys.stdout.write(message["data"])
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import copy_snapshots
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Move EC2 snapshots between regions or accounts."
 
@@ -43,7 +43,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = copy_snapshots(**inputs)
+        result = ec2.copy_snapshots(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
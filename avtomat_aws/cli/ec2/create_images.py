@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import create_images
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Create images (AMI) of EC2 instances."
 
@@ -29,7 +29,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = create_images(**inputs)
+        result = ec2.create_images(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
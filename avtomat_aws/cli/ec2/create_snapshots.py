@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import create_snapshots
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Create EBS snapshots from volumes."
 
@@ -23,7 +23,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = create_snapshots(**inputs)
+        result = ec2.create_snapshots(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
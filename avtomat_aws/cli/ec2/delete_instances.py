@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import delete_instances
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = (
     "Delete EC2 instances and, optionally, any associated resource types."
@@ -43,7 +43,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = delete_instances(**inputs)
+        result = ec2.delete_instances(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
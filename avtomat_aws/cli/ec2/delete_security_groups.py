@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import delete_security_groups
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Delete EC2 security groups."
 
@@ -23,7 +23,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = delete_security_groups(**inputs)
+        result = ec2.delete_security_groups(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
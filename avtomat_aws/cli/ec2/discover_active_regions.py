@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import discover_active_regions
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Discover active regions for an account."
 
@@ -15,7 +15,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_active_regions(**inputs)
+        result = ec2.discover_active_regions(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
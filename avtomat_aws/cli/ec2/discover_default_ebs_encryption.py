@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import discover_default_ebs_encryption
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Discover default EBS encryption."
 
@@ -15,7 +15,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_default_ebs_encryption(**inputs)
+        result = ec2.discover_default_ebs_encryption(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
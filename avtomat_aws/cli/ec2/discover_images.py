@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import discover_images
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Discover AWS images (AMI)."
 
@@ -36,6 +36,13 @@ def add_cli_arguments(parser):
         required=False,
     )
 
+    parser.add_argument(
+        "--detail",
+        action="store_true",
+        help="Return image describe records instead of IDs.",
+        required=False,
+    )
+
 
 def cli(args):
     """Command-line interface function"""
@@ -43,7 +50,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_images(**inputs)
+        result = ec2.discover_images(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
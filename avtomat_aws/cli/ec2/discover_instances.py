@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import discover_instances
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Discover instances."
 
@@ -40,6 +40,19 @@ def add_cli_arguments(parser):
         help="Get only public instances.",
         required=False,
     )
+    parser.add_argument(
+        "--detail",
+        action="store_true",
+        help="Return instance describe records instead of IDs.",
+        required=False,
+    )
+
+    parser.add_argument(
+        "--inventory",
+        action="store_true",
+        help="Answer from the local inventory cache, refreshed when stale.",
+        required=False,
+    )
 
 
 def cli(args):
@@ -48,7 +61,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_instances(**inputs)
+        result = ec2.discover_instances(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import discover_no_ssm_instances
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Discover EC2 instances without SSM enabled."
 
@@ -14,6 +14,25 @@ def add_cli_arguments(parser):
         required=False,
     )
 
+    parser.add_argument(
+        "--stale_days",
+        type=int,
+        help="Also report SSM managed instances by ping status whose last ping is older than this number of days.",
+        required=False,
+    )
+    parser.add_argument(
+        "--agent_versions",
+        action="store_true",
+        help="Also report SSM managed instances by agent version.",
+        required=False,
+    )
+    parser.add_argument(
+        "--inventory",
+        action="store_true",
+        help="Answer from the local inventory cache, refreshed when stale.",
+        required=False,
+    )
+
 
 def cli(args):
     """Command-line interface function"""
@@ -21,7 +40,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_no_ssm_instances(**inputs)
+        result = ec2.discover_no_ssm_instances(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
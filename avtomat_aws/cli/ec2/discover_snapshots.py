@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import discover_snapshots
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Discover snapshots of EBS volumes."
 
@@ -41,6 +41,18 @@ def add_cli_arguments(parser):
         help="Get snapshots created after date (YYYY/MM//DD).",
         required=False,
     )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        help="Number of result pages to fetch ahead in the background.",
+        required=False,
+    )
+    parser.add_argument(
+        "--detail",
+        action="store_true",
+        help="Return snapshot describe records instead of IDs.",
+        required=False,
+    )
 
 
 def cli(args):
@@ -49,7 +61,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_snapshots(**inputs)
+        result = ec2.discover_snapshots(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
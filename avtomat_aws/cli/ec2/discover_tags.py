@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import discover_tags
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Find existing or missing tags on EC2 resources."
 
@@ -18,7 +18,7 @@ def add_cli_arguments(parser):
     required.add_argument(
         "--tags",
         nargs="+",
-        help="Tags in 'Key=Value' or 'Key' format to search for.",
+        help="Tags in 'Key=Value' or 'Key' format to search for, '*' and '?' are wildcards.",
         required=True,
     )
     parser.add_argument(
@@ -34,6 +34,19 @@ def add_cli_arguments(parser):
         required=False,
     )
 
+    parser.add_argument(
+        "--inventory",
+        action="store_true",
+        help="Answer from the local inventory cache, refreshed when stale.",
+        required=False,
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["collections", "index"],
+        help="'collections' describes every resource, 'index' finds tagged resources with one describe_tags pass.",
+        required=False,
+    )
+
 
 def cli(args):
     """Command-line interface function"""
@@ -41,7 +54,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_tags(**inputs)
+        result = ec2.discover_tags(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,12 +1,30 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import discover_unused_security_groups
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Discover unused security groups."
 
 
 def add_cli_arguments(parser):
     """Argument parsing"""
-    pass
+
+    parser.add_argument(
+        "--mode",
+        choices=["full", "eni", "verify"],
+        help="'full' checks every service, 'eni' checks only ENIs, launch templates and classic ELBs, 'verify' runs both and reports differences.",
+        required=False,
+    )
+    parser.add_argument(
+        "--collectors",
+        nargs="+",
+        help="Services to check for attached security groups, separated by space. Leave blank for all. Not supported in verify mode.",
+        required=False,
+    )
+    parser.add_argument(
+        "--skip_collectors",
+        nargs="+",
+        help="Services to skip when checking for attached security groups, separated by space. Not supported in verify mode.",
+        required=False,
+    )
 
 
 def cli(args):
@@ -15,7 +33,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_unused_security_groups(**inputs)
+        result = ec2.discover_unused_security_groups(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
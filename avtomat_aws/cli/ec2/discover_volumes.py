@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import discover_volumes
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Discover EBS volumes."
 
@@ -43,6 +43,25 @@ def add_cli_arguments(parser):
         help="Get only root volumes.",
         required=False,
     )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        help="Number of result pages to fetch ahead in the background.",
+        required=False,
+    )
+    parser.add_argument(
+        "--detail",
+        action="store_true",
+        help="Return volume describe records instead of IDs.",
+        required=False,
+    )
+
+    parser.add_argument(
+        "--inventory",
+        action="store_true",
+        help="Answer from the local inventory cache, refreshed when stale.",
+        required=False,
+    )
 
 
 def cli(args):
@@ -51,7 +70,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_volumes(**inputs)
+        result = ec2.discover_volumes(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
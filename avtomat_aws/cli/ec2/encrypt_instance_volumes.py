@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import encrypt_instance_volumes
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Encrypt all EBS volumes attached to an instance."
 
@@ -29,7 +29,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = encrypt_instance_volumes(**inputs)
+        result = ec2.encrypt_instance_volumes(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
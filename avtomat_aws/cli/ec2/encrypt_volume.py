@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import encrypt_volume
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Encrypt an EBS volume."
 
@@ -27,7 +27,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = encrypt_volume(**inputs)
+        result = ec2.encrypt_volume(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,4 +1,4 @@
-from avtomat_aws.services.ec2 import modify_default_ebs_encryption
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Modify default EBS encryption."
 
@@ -41,7 +41,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        modify_default_ebs_encryption(**inputs)
+        ec2.modify_default_ebs_encryption(**inputs)
     except Exception as e:
         print(f"Action failed - {e}")
         exit(1)
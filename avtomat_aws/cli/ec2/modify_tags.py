@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import modify_tags
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Modify EC2 resource tags."
 
@@ -41,7 +41,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = modify_tags(**inputs)
+        result = ec2.modify_tags(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import modify_volumes
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Modify EBS volumes."
 
@@ -36,7 +36,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = modify_volumes(**inputs)
+        result = ec2.modify_volumes(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
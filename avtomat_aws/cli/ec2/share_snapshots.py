@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.ec2 import share_snapshots
+from avtomat_aws.services import ec2
 
 ACTION_DESCRIPTION = "Share EC2 snapshots with other accounts."
 
@@ -26,7 +26,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = share_snapshots(**inputs)
+        result = ec2.share_snapshots(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.general import get_date
+from avtomat_aws.services import general
 
 ACTION_DESCRIPTION = "Return a date in the requested format."
 
@@ -30,7 +30,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = get_date(**inputs)
+        result = general.get_date(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
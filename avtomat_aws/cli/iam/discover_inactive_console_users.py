@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.iam import discover_inactive_console_users
+from avtomat_aws.services import iam
 
 ACTION_DESCRIPTION = (
     "Discover IAM users with last console sign-in over a certain period."
@@ -25,7 +25,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_inactive_console_users(**inputs)
+        result = iam.discover_inactive_console_users(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
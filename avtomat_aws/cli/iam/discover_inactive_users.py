@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.iam import discover_inactive_users
+from avtomat_aws.services import iam
 
 ACTION_DESCRIPTION = "Discover IAM users who haven't used the console and any access keys over a certain period."
 
@@ -23,7 +23,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_inactive_users(**inputs)
+        result = iam.discover_inactive_users(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
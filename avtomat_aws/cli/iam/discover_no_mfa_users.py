@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.iam import discover_no_mfa_users
+from avtomat_aws.services import iam
 
 ACTION_DESCRIPTION = "Discover IAM users without MFA enabled."
 
@@ -15,7 +15,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_no_mfa_users(**inputs)
+        result = iam.discover_no_mfa_users(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.iam import discover_old_access_keys
+from avtomat_aws.services import iam
 
 ACTION_DESCRIPTION = "Discover IAM access keys over a certain age."
 
@@ -23,7 +23,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_old_access_keys(**inputs)
+        result = iam.discover_old_access_keys(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.iam import discover_permissive_policies
+from avtomat_aws.services import iam
 
 ACTION_DESCRIPTION = "Discover overly permissive IAM policies."
 
@@ -21,7 +21,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_permissive_policies(**inputs)
+        result = iam.discover_permissive_policies(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.iam import discover_unused_roles
+from avtomat_aws.services import iam
 
 ACTION_DESCRIPTION = "Discover IAM roles not used over a certain amount of days."
 
@@ -23,7 +23,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_unused_roles(**inputs)
+        result = iam.discover_unused_roles(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
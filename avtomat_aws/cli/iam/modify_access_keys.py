@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.iam import modify_access_keys
+from avtomat_aws.services import iam
 
 ACTION_DESCRIPTION = "Enable or disable an IAM access key."
 
@@ -40,7 +40,7 @@ def cli(args):
     }
 
     try:
-        result = modify_access_keys(**inputs)
+        result = iam.modify_access_keys(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
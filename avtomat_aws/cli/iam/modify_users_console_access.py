@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.iam import modify_users_console_access
+from avtomat_aws.services import iam
 
 ACTION_DESCRIPTION = "Enable or disable AWS Management Console access for an IAM user."
 
@@ -42,7 +42,7 @@ def cli(args):
     }
 
     try:
-        result = modify_users_console_access(**inputs)
+        result = iam.modify_users_console_access(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
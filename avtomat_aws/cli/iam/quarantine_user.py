@@ -1,4 +1,4 @@
-from avtomat_aws.services.iam import quarantine_user
+from avtomat_aws.services import iam
 
 ACTION_DESCRIPTION = "Disable console and programmatic access and apply AWSCompromisedKeyQuarantineV2 policy to an IAM user."
 
@@ -17,7 +17,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        quarantine_user(**inputs)
+        iam.quarantine_user(**inputs)
     except Exception as e:
         print(f"Action failed - {e}")
         exit(1)
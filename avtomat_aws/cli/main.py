@@ -1,10 +1,11 @@
 import argparse
 import sys
-from importlib import import_module, metadata
+from importlib import import_module
 
-from .services import SERVICES
+from avtomat_aws.helpers.cli.export import EXPORT_FORMATS
+from avtomat_aws.helpers.cli.set_output import STREAMING_OUTPUTS
 
-VERSION = metadata.version("avtomat_aws")
+from .services import SERVICES
 
 
 def display_help():
@@ -14,6 +15,9 @@ def display_help():
     print("options:")
     print("    -h, --help            Show this help message and exit.")
     print("    -v, --version         Show the current version and exit.\n")
+    print("commands:")
+    print("    daemon                Manage the local daemon, used with AAWS_DAEMON=1.")
+    print("    run                   Run a plan of actions from a JSON or YAML file.\n")
     print("services:")
     # Display services in two columns
     services_list = list(SERVICES.keys())
@@ -80,6 +84,41 @@ def set_parser(service, action):
         help="Region for operation. Leave blank for session default.",
         required=False,
     )
+    parser.add_argument(
+        "--regions",
+        nargs="+",
+        help="Regions to run a discovery action across concurrently, separated by space, or 'all'.",
+        required=False,
+    )
+    parser.add_argument(
+        "--role_arns",
+        nargs="+",
+        help="Role ARNs to assume and run the action with concurrently, separated by space.",
+        required=False,
+    )
+    parser.add_argument(
+        "--account_ids",
+        nargs="+",
+        help="Account IDs to run the action in concurrently, separated by space. Requires --role_name.",
+        required=False,
+    )
+    parser.add_argument(
+        "--role_name",
+        help="Name of the role to assume in each of the --account_ids.",
+        required=False,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Maximum number of concurrent workers, shared across accounts, regions and actions.",
+        required=False,
+    )
+    parser.add_argument(
+        "--partial",
+        action="store_true",
+        help="Return the results of the regions and accounts that succeeded when others fail.",
+        required=False,
+    )
     parser.add_argument(
         "--debug", action="store_true", help="Increase log verbosity.", required=False
     )
@@ -87,7 +126,27 @@ def set_parser(service, action):
         "--silent", action="store_true", help="Decrease log verbosity.", required=False
     )
     parser.add_argument(
-        "--output", help="Output format.", choices=["table"], required=False
+        "--output",
+        help="Output format. Records are printed as they are discovered.",
+        choices=["table", "json", "ndjson"],
+        required=False,
+    )
+    parser.add_argument(
+        "--max_width",
+        type=int,
+        help="Maximum table column width, longer values are truncated. Values are shown in full by default.",
+        required=False,
+    )
+    parser.add_argument(
+        "--export",
+        help="File to write the results to as they are discovered.",
+        required=False,
+    )
+    parser.add_argument(
+        "--export_format",
+        help="Export format. Defaults to 'csv' for .csv files and 'columns' otherwise.",
+        choices=EXPORT_FORMATS,
+        required=False,
     )
 
     # Use the imported module's function to add its arguments to the parser
@@ -101,12 +160,39 @@ def set_parser(service, action):
     return parser
 
 
+def parse_arguments(parser, argv):
+    """Parse the action arguments."""
+
+    args = parser.parse_args(argv)
+    # Actions that can, yield records for streaming formats instead of collecting them
+    if args.output in STREAMING_OUTPUTS or args.export:
+        args.stream = True
+
+    return args
+
+
 def main():
     """Main function for the CLI."""
 
     # Version
     if len(sys.argv) == 2 and (sys.argv[1] == "--version" or sys.argv[1] == "-v"):
-        print(f"aaws {VERSION}")
+        # Resolved on demand, scanning installed distributions slows down every other command
+        from importlib import metadata
+
+        print(f"aaws {metadata.version('avtomat_aws')}")
+        sys.exit(0)
+
+    # Daemon management
+    if len(sys.argv) >= 2 and sys.argv[1] == "daemon":
+        from .daemon import daemon_cli
+
+        daemon_cli(sys.argv[2:])
+
+    # Plan execution
+    if len(sys.argv) >= 2 and sys.argv[1] == "run":
+        from .run import run_cli
+
+        run_cli(sys.argv[2:])
         sys.exit(0)
 
     # Not enough arguments
@@ -136,10 +222,17 @@ def main():
         display_action_help(service, action)
         sys.exit(0)
 
+    # Execute on the daemon if forwarding is enabled with AAWS_DAEMON and one is running
+    from .daemon import forward
+
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
     # Execute
     service, action = sys.argv[1:3]
     parser = set_parser(service, action)
-    args = parser.parse_args(sys.argv[3:])
+    args = parse_arguments(parser, sys.argv[3:])
     args.func(args)
 
 
@@ -0,0 +1,266 @@
+import argparse
+import json
+import re
+import sys
+from importlib import import_module
+
+from avtomat_aws.helpers.cli.set_output import set_output
+
+from .services import SERVICES
+
+ACTION_DESCRIPTION = (
+    "Run a plan of actions in one process, passing results between steps."
+)
+
+REFERENCE = re.compile(r"^\$\{(\w+)\}$")
+# Parameters that bring their own credentials instead of the plan's shared session
+AUTHENTICATION_PARAMETERS = [
+    "session",
+    "profile",
+    "role_arn",
+    "access_key",
+    "role_arns",
+    "account_ids",
+]
+# Plan parameters dropped for steps that bring their own credentials, as accounts do
+CREDENTIAL_PARAMETERS = AUTHENTICATION_PARAMETERS + ["secret_key", "session_token"]
+
+
+def load_plan(path):
+    """Load a JSON or YAML plan."""
+
+    with open(path) as f:
+        if not path.endswith((".yaml", ".yml")):
+            return json.load(f)
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(
+                "YAML plans require PyYAML, install 'avtomat-aws[yaml]' or use a JSON plan"
+            )
+        return yaml.safe_load(f)
+
+
+def find_references(value):
+    """Return the names of the steps a parameter value references."""
+
+    if isinstance(value, str):
+        match = REFERENCE.match(value)
+        return {match.group(1)} if match else set()
+    if isinstance(value, list):
+        return set().union(*[find_references(item) for item in value])
+    if isinstance(value, dict):
+        return set().union(*[find_references(item) for item in value.values()])
+    return set()
+
+
+def resolve_references(value, results):
+    """Replace step references in a parameter value with the steps' results."""
+
+    if isinstance(value, str):
+        match = REFERENCE.match(value)
+        return results[match.group(1)] if match else value
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results) for key, item in value.items()}
+    return value
+
+
+def set_steps(plan):
+    """Validate the plan's steps and return them with their dependencies."""
+
+    if not isinstance(plan, dict) or not isinstance(plan.get("steps"), dict):
+        raise ValueError("Plan must have a 'steps' mapping of step names to steps")
+
+    steps = {}
+    for name, step in plan["steps"].items():
+        if not isinstance(step, dict):
+            raise ValueError(f"Step '{name}' - must be a mapping")
+        service, action = step.get("service"), step.get("action")
+        if action not in SERVICES.get(service, []):
+            raise ValueError(f"Step '{name}' - invalid action: {service} {action}")
+        parameters = step.get("parameters", {})
+        depends_on = find_references(parameters) | set(step.get("depends_on", []))
+        unknown = depends_on - set(plan["steps"])
+        if unknown:
+            raise ValueError(f"Step '{name}' - unknown steps: {', '.join(unknown)}")
+        steps[name] = {
+            "service": service,
+            "action": action,
+            "parameters": parameters,
+            "depends_on": depends_on,
+        }
+
+    return steps
+
+
+def order_steps(steps):
+    """Group steps into levels, each depending only on steps in earlier levels."""
+
+    levels = []
+    done = set()
+    while len(done) < len(steps):
+        level = [
+            name
+            for name, step in steps.items()
+            if name not in done and step["depends_on"] <= done
+        ]
+        if not level:
+            remaining = ", ".join(name for name in steps if name not in done)
+            raise ValueError(f"Plan has circular references between: {remaining}")
+        levels.append(level)
+        done.update(level)
+
+    return levels
+
+
+def estimate_calls(step):
+    """Estimate the API calls a step makes from its parameters."""
+
+    if step["action"].startswith("discover_"):
+        return "1+ (paginated)"
+
+    # Bulk actions make a call per item of their list parameters
+    estimates = []
+    for key, value in step["parameters"].items():
+        if not isinstance(value, (str, list)):
+            continue
+        if isinstance(value, str):
+            match = REFERENCE.match(value)
+            if match:
+                estimates.append(f"1 per result of '{match.group(1)}'")
+        elif key.endswith(("_ids", "_arns", "_names")):
+            estimates.append(str(len(value)))
+
+    return " + ".join(estimates) or "1"
+
+
+def display_plan(steps, levels):
+    """Print the execution plan."""
+
+    print(f"{len(steps)} steps in {len(levels)} levels\n")
+    for number, level in enumerate(levels, start=1):
+        print(f"level {number}:")
+        for name in level:
+            step = steps[name]
+            print(f"    {name} - {step['service']} {step['action']}")
+            if step["depends_on"]:
+                print(f"        depends on: {', '.join(sorted(step['depends_on']))}")
+            print(f"        estimated API calls: {estimate_calls(step)}")
+
+
+def run_plan(plan, steps, levels, workers=None, debug=None, silent=None):
+    """Run the plan's steps level by level, return results and failures keyed by step."""
+
+    from avtomat_aws.helpers.fan_out import fan_out
+    from avtomat_aws.helpers.set_session import set_session
+
+    defaults = {**plan.get("parameters", {})}
+    if debug:
+        defaults["debug"] = True
+    if silent:
+        defaults["silent"] = True
+    # One session, and with it one client pool, for every step
+    session = set_session(**defaults)
+
+    results = {}
+    failed = {}
+
+    def run(name):
+        step = steps[name]
+        parameters = resolve_references(step["parameters"], results)
+        if any(parameters.get(key) for key in AUTHENTICATION_PARAMETERS):
+            parameters = {
+                **defaults,
+                **dict.fromkeys(CREDENTIAL_PARAMETERS),
+                **parameters,
+            }
+        else:
+            parameters = {**defaults, **parameters, "session": session}
+        service = import_module(f"avtomat_aws.services.{step['service']}")
+        return getattr(service, step["action"])(**parameters)
+
+    for level in levels:
+        # Steps depending on a failed step are skipped
+        runnable = []
+        for name in level:
+            if steps[name]["depends_on"] & set(failed):
+                failed[name] = ValueError("skipped, a step it depends on failed")
+                sys.stderr.write(f"Step {name} - skipped\n")
+            else:
+                runnable.append(name)
+
+        level_results, level_failed = fan_out(
+            run, runnable, workers=workers, label="Step"
+        )
+        results.update(level_results)
+        failed.update(level_failed)
+
+    return results, failed
+
+
+def set_parser():
+    """Set the parser for the run command."""
+
+    parser = argparse.ArgumentParser(prog="aaws run", description=ACTION_DESCRIPTION)
+    parser.add_argument(
+        "plan", help="Path to a JSON plan, or a YAML plan with avtomat-aws[yaml]."
+    )
+    parser.add_argument(
+        "--dry_run",
+        action="store_true",
+        help="Print the execution plan and estimated API calls without running it.",
+        required=False,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Maximum number of steps to run concurrently.",
+        required=False,
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Increase log verbosity.", required=False
+    )
+    parser.add_argument(
+        "--silent", action="store_true", help="Decrease log verbosity.", required=False
+    )
+    parser.add_argument(
+        "--output",
+        help="Output format.",
+        choices=["table", "json", "ndjson"],
+        required=False,
+    )
+
+    return parser
+
+
+def run_cli(argv):
+    """Command-line interface function"""
+
+    args = set_parser().parse_args(argv)
+
+    try:
+        plan = load_plan(args.plan)
+        steps = set_steps(plan)
+        levels = order_steps(steps)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error: Invalid plan - {e}\n")
+        sys.exit(1)
+
+    if args.dry_run:
+        display_plan(steps, levels)
+        sys.exit(0)
+
+    try:
+        results, failed = run_plan(
+            plan, steps, levels, args.workers, args.debug, args.silent
+        )
+        set_output(results, vars(args))
+    except Exception as e:
+        print(f"Action failed - {e}")
+        exit(1)
+
+    if failed:
+        sys.stderr.write(f"Error: {len(failed)} steps failed: {', '.join(failed)}\n")
+        sys.exit(1)
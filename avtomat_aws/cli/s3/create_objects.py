@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.s3 import create_objects
+from avtomat_aws.services import s3
 
 ACTION_DESCRIPTION = "Create objects in an S3 bucket."
 
@@ -40,7 +40,7 @@ def cli(args):
     }
 
     try:
-        result = create_objects(**inputs)
+        result = s3.create_objects(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.s3 import delete_objects
+from avtomat_aws.services import s3
 
 ACTION_DESCRIPTION = "Delete objects from an S3 bucket."
 
@@ -27,7 +27,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = delete_objects(**inputs)
+        result = s3.delete_objects(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.s3 import discover_objects
+from avtomat_aws.services import s3
 
 ACTION_DESCRIPTION = "Discover objects in an S3 bucket."
 
@@ -29,6 +29,12 @@ def add_cli_arguments(parser):
         help="Return only the object name, not the entire path.",
         required=False,
     )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        help="Number of result pages to fetch ahead in the background.",
+        required=False,
+    )
 
 
 def cli(args):
@@ -37,7 +43,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = discover_objects(**inputs)
+        result = s3.discover_objects(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
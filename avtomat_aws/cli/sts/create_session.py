@@ -1,6 +1,6 @@
 import os
 
-from avtomat_aws.services.sts import create_session
+from avtomat_aws.services import sts
 
 ACTION_DESCRIPTION = "Create an authenticated session."
 
@@ -59,7 +59,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = create_session(**inputs)
+        result = sts.create_session(**inputs)
         if os.name == "nt":
             print_environment_powershell(result)
         else:
@@ -1,5 +1,5 @@
 from avtomat_aws.helpers.cli.set_output import set_output
-from avtomat_aws.services.sts import whoami
+from avtomat_aws.services import sts
 
 ACTION_DESCRIPTION = "Return current entity."
 
@@ -15,7 +15,7 @@ def cli(args):
     inputs = vars(args)
 
     try:
-        result = whoami(**inputs)
+        result = sts.whoami(**inputs)
         set_output(result, inputs)
     except Exception as e:
         print(f"Action failed - {e}")
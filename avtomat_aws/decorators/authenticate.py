@@ -1,12 +1,29 @@
+import logging
+
+from avtomat_aws.helpers.fan_out import fan_out, split_workers
+from avtomat_aws.helpers.set_accounts import set_accounts
 from avtomat_aws.helpers.set_region import set_region
+from avtomat_aws.helpers.set_regions import set_regions
 from avtomat_aws.helpers.set_session import set_session
 
+logger = logging.getLogger(__name__)
+
 
-def authenticate():
+def authenticate(multi_region=False):
     """Decorator to authenticate with AWS and set a region for the action."""
 
     def decorator(func):
         def wrapper(**kwargs):
+            # Run the action across multiple accounts
+            if kwargs.get("role_arns") or kwargs.get("account_ids"):
+                return run_accounts(func, multi_region, **kwargs)
+            # Run the action across multiple regions
+            if kwargs.get("regions"):
+                if not multi_region:
+                    raise ValueError(
+                        "Parameter 'regions' is not supported by this action"
+                    )
+                return run_regions(func, **kwargs)
             # Create a session
             kwargs["session"] = set_session(**kwargs)
             # Set the region for the session
@@ -22,3 +39,115 @@ def authenticate():
         return wrapper
 
     return decorator
+
+
+def run_regions(func, **kwargs):
+    """Run an action concurrently across regions and return region-keyed results."""
+
+    # Each region's results are collected on a worker thread, so they can't be streamed
+    kwargs.pop("stream", None)
+
+    session = set_session(**kwargs)
+    region = set_region(
+        region=kwargs.get("region"),
+        session=session,
+        debug=kwargs.get("debug"),
+        silent=kwargs.get("silent"),
+    )
+    regions = set_regions(
+        kwargs.pop("regions"),
+        session=session,
+        region=region,
+        debug=kwargs.get("debug"),
+        silent=kwargs.get("silent"),
+    )
+
+    logger.info(f"Running across {len(regions)} regions")
+
+    # Workers are shared between the regions and the pools each region's action runs
+    workers, kwargs["workers"] = split_workers(kwargs.get("workers"), len(regions))
+
+    def run(region):
+        region_kwargs = {**kwargs, "region": region}
+        # Sessions are cached per region, so each region gets its own session and clients
+        region_kwargs["session"] = set_session(**region_kwargs)
+        return func(**region_kwargs)
+
+    results, failed = fan_out(run, regions, workers=workers, label="Region")
+
+    check_failed(results, failed, "regions", kwargs.get("partial"))
+
+    return results
+
+
+def run_accounts(func, multi_region, **kwargs):
+    """Run an action concurrently across accounts and return account-keyed results."""
+
+    # Each account's results are collected on a worker thread, so they can't be streamed
+    kwargs.pop("stream", None)
+
+    accounts = set_accounts(
+        role_arns=kwargs.pop("role_arns", None),
+        account_ids=kwargs.pop("account_ids", None),
+        role_name=kwargs.pop("role_name", None),
+        debug=kwargs.get("debug"),
+        silent=kwargs.get("silent"),
+    )
+    if kwargs.get("regions") and not multi_region:
+        raise ValueError("Parameter 'regions' is not supported by this action")
+
+    # Roles are assumed from the session the caller authenticated with
+    source_session = set_session(**kwargs)
+
+    logger.info(f"Running across {len(accounts)} accounts")
+
+    # Workers are shared between the accounts and the regions or pools each account runs
+    workers, kwargs["workers"] = split_workers(kwargs.get("workers"), len(accounts))
+
+    def run(account_id):
+        account_kwargs = {
+            **kwargs,
+            "role_arn": accounts[account_id],
+            "source_session": source_session,
+            "session": None,
+            "profile": None,
+            "access_key": None,
+            "secret_key": None,
+            "session_token": None,
+        }
+        if account_kwargs.get("regions"):
+            return run_regions(func, **account_kwargs)
+        # Assumed role sessions are cached and renewed shortly before their credentials expire
+        account_kwargs["session"] = set_session(**account_kwargs)
+        account_kwargs["region"] = set_region(
+            region=account_kwargs.get("region"),
+            session=account_kwargs["session"],
+            debug=account_kwargs.get("debug"),
+            silent=account_kwargs.get("silent"),
+        )
+        return func(**account_kwargs)
+
+    results, failed = fan_out(run, accounts, workers=workers, label="Account")
+
+    check_failed(results, failed, "accounts", kwargs.get("partial"))
+
+    return results
+
+
+def check_failed(results, failed, label, partial=False):
+    """Raise if any region or account failed, unless partial results are allowed.
+
+    Failed regions or accounts are left out of the results, so without 'partial' they'd look like ones with nothing found.
+    """
+
+    if not failed:
+        return
+    if not results:
+        raise next(iter(failed.values()))
+    if not partial:
+        raise RuntimeError(
+            f"{len(failed)} {label} failed: {', '.join(map(str, failed))}. "
+            "Set 'partial' to return the results of the others"
+        )
+    logger.warning(f"{len(failed)} {label} failed, left out of the results")
+    logger.debug(list(failed))
@@ -0,0 +1,27 @@
+import logging
+import sqlite3
+
+from avtomat_aws.helpers.inventory import clear_inventory
+
+logger = logging.getLogger(__name__)
+
+
+def invalidate_inventory(resource_types=None):
+    """Decorator to mark the inventory of resource types stale after a mutating action runs."""
+
+    def decorator(func):
+        def wrapper(**kwargs):
+            try:
+                return func(**kwargs)
+            finally:
+                # Also the region resources were copied to, if any
+                regions = {kwargs["region"], kwargs.get("target_region")} - {None}
+                for region in regions:
+                    try:
+                        clear_inventory(region, resource_types)
+                    except (OSError, sqlite3.Error) as e:
+                        logger.warning(f"Failed to clear inventory for {region} - {e}")
+
+        return wrapper
+
+    return decorator
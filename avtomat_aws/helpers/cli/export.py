@@ -0,0 +1,179 @@
+import csv
+import datetime
+import json
+import tempfile
+from itertools import chain, islice
+
+EXPORT_FORMATS = ["csv", "columns"]
+SAMPLE_SIZE = 1000  # Records kept in memory, later ones are spilled to disk until the CSV headers are known
+ROW_GROUP_SIZE = 10000  # Records per row group in the columns format
+
+
+def set_export_format(path, export_format=None):
+    """Return the export format, inferred from the file extension when not set."""
+
+    if export_format:
+        return export_format
+    return "csv" if path.lower().endswith(".csv") else "columns"
+
+
+def flatten_results(data, levels=1, target=None):
+    """Yield records of region or account keyed results with the key they came from.
+
+    Only the 'levels' of nesting added by running across regions and accounts are flattened,
+    scalar and mapping results become a single record.
+    """
+
+    for key, value in data.items():
+        key = f"{target}/{key}" if target else key
+        if levels > 1:
+            yield from flatten_results(value, levels - 1, key)
+        elif isinstance(value, (dict, str, bytes, bool, int, float, datetime.datetime)):
+            yield {"Target": key, **to_record(value)}
+        else:
+            for record in value or []:
+                yield {"Target": key, **to_record(record)}
+
+
+def to_record(record):
+    """Turn an ID into a record and nested mappings into dotted columns, e.g. 'State.Name'."""
+
+    if not isinstance(record, dict):
+        return {"Resources": record}
+
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict) and value:
+            for nested_key, nested_value in to_record(value).items():
+                flat[f"{key}.{nested_key}"] = nested_value
+        else:
+            flat[key] = value
+
+    return flat
+
+
+def encode(value):
+    """Encode values JSON doesn't support, datetimes as ISO 8601."""
+
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def to_cell(value):
+    """Turn a value into a CSV cell, nested values are JSON encoded."""
+
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=encode)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def export_csv(records, f):
+    """Write records as CSV with a column for every key of every record.
+
+    Records after the first 'SAMPLE_SIZE' are spilled to a temporary file until all headers are seen.
+    """
+
+    records = iter(records)
+    sample = [
+        {key: to_cell(value) for key, value in record.items()}
+        for record in islice(records, SAMPLE_SIZE)
+    ]
+    headers = dict.fromkeys(key for record in sample for key in record)
+
+    with tempfile.TemporaryFile("w+") as spill:
+        for record in records:
+            headers.update(dict.fromkeys(record))
+            row = {key: to_cell(value) for key, value in record.items()}
+            spill.write(json.dumps(row, default=encode) + "\n")
+        spill.seek(0)
+
+        writer = csv.DictWriter(f, fieldnames=list(headers))
+        writer.writeheader()
+
+        count = 0
+        for row in chain(sample, (json.loads(line) for line in spill)):
+            writer.writerow(row)
+            count += 1
+
+    return count
+
+
+def column_type(values):
+    """Return the type of a column from its first value."""
+
+    value = next((value for value in values if value is not None), None)
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, datetime.datetime):
+        return "datetime"
+    if isinstance(value, (list, dict)):
+        return "json"
+    return "string"
+
+
+def write_row_group(group, f):
+    """Write records as one line of typed columns."""
+
+    headers = list(dict.fromkeys(key for record in group for key in record))
+    columns = {header: [record.get(header) for record in group] for header in headers}
+    row_group = {
+        "rows": len(group),
+        "types": {header: column_type(values) for header, values in columns.items()},
+        "columns": columns,
+    }
+    f.write(json.dumps(row_group, default=encode) + "\n")
+
+
+def export_columns(records, f):
+    """Write records as row groups of typed columns, one JSON document per line.
+
+    Each line loads into a data frame with e.g. 'pandas.DataFrame(json.loads(line)["columns"])'.
+    """
+
+    count = 0
+    group = []
+    for record in records:
+        group.append(record)
+        if len(group) == ROW_GROUP_SIZE:
+            write_row_group(group, f)
+            count += len(group)
+            group = []
+    if group:
+        write_row_group(group, f)
+        count += len(group)
+
+    return count
+
+
+def export_records(data, inputs):
+    """Write the result of an action to a file as records are discovered, return the number written."""
+
+    path = inputs["export"]
+    export_format = set_export_format(path, inputs.get("export_format"))
+
+    # Results of actions run across regions or accounts are keyed by them, accounts first
+    levels = bool(inputs.get("regions")) + bool(
+        inputs.get("role_arns") or inputs.get("account_ids")
+    )
+    if levels:
+        records = flatten_results(data, levels)
+    elif isinstance(data, dict):
+        records = [to_record(data)]
+    elif isinstance(data, (str, datetime.datetime)):
+        records = [{"Resources": data}]
+    else:
+        records = (to_record(record) for record in data)
+
+    with open(path, "w", newline="") as f:
+        if export_format == "csv":
+            return export_csv(records, f)
+        return export_columns(records, f)
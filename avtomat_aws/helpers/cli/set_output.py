@@ -1,10 +1,69 @@
+import json
+import os
+import sys
+
+from .export import export_records
 from .table import output_table
 
+# Formats printing records as the action yields them
+STREAMING_OUTPUTS = ["table", "json", "ndjson"]
+
 
 def set_output(data, inputs):
     """Print the result of an action."""
 
-    if inputs.get("output") == "table":
-        output_table(data)
+    if inputs.get("export"):
+        count = export_records(data, inputs)
+        print(f"{count} records exported to {inputs['export']}")
+        return
+
+    if inputs.get("output") in STREAMING_OUTPUTS:
+        try:
+            if inputs["output"] == "table":
+                output_table(data, inputs.get("max_width"))
+            elif inputs["output"] == "json":
+                output_json(data)
+            else:
+                output_ndjson(data)
+        except BrokenPipeError:
+            if not hasattr(sys.stdout, "fileno"):
+                raise
+            # The reader stopped early (e.g. 'head'), stop consuming results and discard buffered output
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
     else:
         print(data)
+
+
+def is_records(data):
+    """Check if data is a sequence of records rather than a single value."""
+
+    return not isinstance(data, (dict, str, bytes)) and hasattr(data, "__iter__")
+
+
+def output_json(data):
+    """Print data as JSON, writing records one at a time."""
+
+    if not is_records(data):
+        print(json.dumps(data, default=str, indent=2))
+        return
+
+    count = 0
+    for record in data:
+        print("[" if not count else ",")
+        print(f"  {json.dumps(record, default=str)}", end="")
+        count += 1
+    print("\n]" if count else "[]")
+
+
+def output_ndjson(data):
+    """Print data as newline delimited JSON, one record per line."""
+
+    if isinstance(data, dict):
+        # Region or account keyed results, one line per key
+        data = ({key: value} for key, value in data.items())
+    elif not is_records(data):
+        data = [data]
+
+    for record in data:
+        print(json.dumps(record, default=str))
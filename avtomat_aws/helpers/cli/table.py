@@ -1,4 +1,8 @@
 import datetime
+from itertools import chain, islice
+
+SAMPLE_SIZE = 1000  # Rows used to pick headers and column widths
+BATCH_SIZE = 1000  # Rows written at once
 
 
 def preprocess_data(data):
@@ -8,64 +12,84 @@ def preprocess_data(data):
         data = [data]
 
 
-def table_from_list_dict_data(data):
-    """Print a table from a list of dictionaries."""
+def truncate(value, width):
+    """Truncate a value to the column width, marking the cut."""
 
-    headers = sorted(
-        set(key for item in data for key in item.keys())
-    )  # Sort headers for consistent ordering
-    column_widths = {
-        header: max(len(header), max(len(str(item.get(header, ""))) for item in data))
-        for header in headers
-    }
+    if len(value) <= width:
+        return value
+    return value[: width - 3] + "..."
 
-    # Print table header
-    header_row = (
-        "+" + "+".join(["-" * (column_widths[header] + 2) for header in headers]) + "+"
-    )
-    print(header_row)
-    header_content = "|".join(
-        [" " + header.ljust(column_widths[header]) + " " for header in headers]
-    )
-    print(f"|{header_content}|")
-    print(header_row.replace("-", "-"))
 
-    # Print each row of data without dividers between rows
-    for item in data:
-        row_data = [
-            " " + str(item.get(header, "")).ljust(column_widths[header]) + " "
-            for header in headers
-        ]
-        print(f"|{'|'.join(row_data)}|")
+def stream_table(rows, sample_size=SAMPLE_SIZE, max_width=None):
+    """Print a table of dictionary or string rows as they arrive.
 
+    Headers and column widths come from the first 'sample_size' rows, keys first seen after them aren't shown.
+    Values are shown in full, overflowing their column if wider than the sample, unless truncated to 'max_width'.
+    """
 
-def table_from_list_data(data):
-    """Print a table from a list of strings."""
+    rows = iter(rows)
+    sample = list(islice(rows, sample_size))
+    if not sample:
+        return
 
-    header = "Resources"
-    column_width = max(len(header), max(len(item) for item in data))
+    if all(isinstance(row, str) for row in sample):
+        headers = ["Resources"]
+        spec = "^"
+    elif all(isinstance(row, dict) for row in sample):
+        headers = sorted(set(key for row in sample for key in row.keys()))
+        spec = "<"
+    else:
+        print("Mixed or unsupported data format.")
+        return
+
+    widths = {header: len(header) for header in headers}
+    for row in sample:
+        cells = row if isinstance(row, dict) else {"Resources": row}
+        for header in headers:
+            widths[header] = max(widths[header], len(str(cells.get(header, ""))))
+    if max_width:
+        widths = {header: min(width, max_width) for header, width in widths.items()}
+
+    # One format string for every row, e.g. "| {:<10} | {:<7} |"
+    row_format = (
+        "| " + " | ".join(f"{{:{spec}{widths[header]}}}" for header in headers) + " |"
+    )
 
     # Print table header
-    header_row = f"+{'-' * (column_width + 2)}+"
+    header_row = (
+        "+" + "+".join(["-" * (widths[header] + 2) for header in headers]) + "+"
+    )
+    print(header_row)
+    print(row_format.format(*headers))
     print(header_row)
-    print(f"| {header.center(column_width)} |")
-    print(header_row.replace("-", "-"))
-
-    # Print each row without dividers between rows
-    for item in data:
-        print(f"| {item.center(column_width)} |")
-
 
-def output_table(data):
+    # Print rows as they arrive without dividers between rows, written in batches
+    column_widths = [widths[header] for header in headers]
+    lines = []
+    for row in chain(sample, rows):
+        if isinstance(row, dict):
+            values = [str(row.get(header, "")) for header in headers]
+        else:
+            values = [str(row)]
+        if max_width:
+            values = [
+                value if len(value) <= width else truncate(value, width)
+                for value, width in zip(values, column_widths)
+            ]
+        lines.append(row_format.format(*values))
+        if len(lines) == BATCH_SIZE:
+            print("\n".join(lines))
+            lines = []
+    if lines:
+        print("\n".join(lines))
+
+
+def output_table(data, max_width=None):
     """Print a table for CLI output."""
 
     if isinstance(data, datetime.datetime):
-        table_from_list_data([str(data)])
+        stream_table([str(data)], max_width=max_width)
     elif isinstance(data, dict):
-        table_from_list_dict_data([data])
-    elif all(isinstance(item, dict) for item in data):
-        table_from_list_dict_data(data)
-    elif all(isinstance(item, str) for item in data):
-        table_from_list_data(data)
+        stream_table([data], max_width=max_width)
     else:
-        print("Mixed or unsupported data format.")
+        stream_table(data, max_width=max_width)
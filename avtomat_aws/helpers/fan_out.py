@@ -0,0 +1,52 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+WORKERS = 8  # Default size of the thread pool
+
+
+def fan_out(task, items, workers=None, label="Item"):
+    """Run a task for each item concurrently, return results and failures keyed by item.
+
+    Results are keyed by item, so duplicate items collapse into one entry, deduplicate them first.
+    """
+
+    items = list(items)
+    results = {}
+    failed = {}
+
+    if not items:
+        return results, failed
+
+    def run(item):
+        start = time.perf_counter()
+        try:
+            return task(item), None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    max_workers = min(workers or WORKERS, len(items))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 'map' yields in submission order, so results keep the order of the items
+        for item, (result, error, elapsed) in zip(items, executor.map(run, items)):
+            if error:
+                failed[item] = error
+                logger.error(f"{label} {item} - failed after {elapsed:.2f}s - {error}")
+            else:
+                results[item] = result
+                logger.debug(f"{label} {item} - completed in {elapsed:.2f}s")
+
+    return results, failed
+
+
+def split_workers(workers, count):
+    """Split a worker budget between a pool over 'count' items and the pools each item runs.
+
+    Return the outer pool size and the workers left to each item, so nested pools stay within budget.
+    """
+
+    budget = workers or WORKERS
+    outer = max(1, min(budget, count))
+    return outer, max(1, budget // outer)
@@ -0,0 +1,46 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from avtomat_aws.helpers.fan_out import WORKERS
+from avtomat_aws.helpers.paginate import paginate
+from avtomat_aws.helpers.throttle import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# IAM is a global service with low request quotas, each user check makes a few calls
+IAM_RATE = 10  # User checks started per second
+IAM_BURST = 20
+
+
+def fan_out_users(check, iam_client, workers=None):
+    """Run a check for every IAM user concurrently, yield (user, result) pairs in list_users order.
+
+    Pairs are yielded as soon as the checks of every earlier user have completed, so results can be streamed.
+    Checks back off their own throttled calls and skip the items that fail, a check that raises leaves its user out.
+    """
+
+    users = list(paginate(iam_client, "list_users", "Users", page_size=1000))
+    logger.debug(f"Checking {len(users)} users")
+    if not users:
+        return
+
+    acquire = rate_limiter(IAM_RATE, IAM_BURST)
+
+    def run(user):
+        try:
+            acquire()
+            return check(user), None
+        except Exception as e:
+            return None, e
+
+    executor = ThreadPoolExecutor(max_workers=min(workers or WORKERS, len(users)))
+    try:
+        # 'map' yields in submission order, holding back checks that complete early
+        for user, (result, error) in zip(users, executor.map(run, users)):
+            if error:
+                logger.error(f"User {user['UserName']} - failed - {error}")
+                continue
+            yield user, result
+    finally:
+        # Checks not started yet are dropped when the caller stops reading early
+        executor.shutdown(wait=False, cancel_futures=True)
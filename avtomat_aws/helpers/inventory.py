@@ -0,0 +1,243 @@
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from avtomat_aws.helpers.paginate import paginate
+from avtomat_aws.helpers.set_session import get_identity
+from avtomat_aws.helpers.set_session_objects import set_session_objects
+
+logger = logging.getLogger(__name__)
+
+# Bulk describe call, result key, ID key, state key and seconds a pass stays fresh per resource type
+INVENTORY_TYPES = {
+    "instance": {
+        "operation": "describe_instances",
+        "result_key": "Reservations",
+        "id_key": "InstanceId",
+        "state_key": "State",
+        "params": {},
+        "ttl": 300,
+    },
+    "volume": {
+        "operation": "describe_volumes",
+        "result_key": "Volumes",
+        "id_key": "VolumeId",
+        "state_key": "State",
+        "params": {},
+        "ttl": 300,
+    },
+    "snapshot": {
+        "operation": "describe_snapshots",
+        "result_key": "Snapshots",
+        "id_key": "SnapshotId",
+        "state_key": "State",
+        "params": {"OwnerIds": ["self"]},
+        "ttl": 900,
+    },
+    "image": {
+        "operation": "describe_images",
+        "result_key": "Images",
+        "id_key": "ImageId",
+        "state_key": "State",
+        "params": {"Owners": ["self"]},
+        "ttl": 900,
+    },
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS inventories (
+    account TEXT, region TEXT, type TEXT, refreshed REAL,
+    PRIMARY KEY (account, region, type)
+);
+CREATE TABLE IF NOT EXISTS resources (
+    account TEXT, region TEXT, type TEXT, id TEXT, state TEXT, data TEXT,
+    PRIMARY KEY (account, region, type, id)
+);
+CREATE INDEX IF NOT EXISTS resources_state ON resources (account, region, type, state);
+CREATE TABLE IF NOT EXISTS tags (
+    account TEXT, region TEXT, type TEXT, id TEXT, key TEXT, value TEXT
+);
+CREATE INDEX IF NOT EXISTS tags_key_value ON tags (account, region, type, key, value);
+"""
+
+
+def inventory_path():
+    """Return the inventory database path, overridable with AAWS_INVENTORY."""
+
+    if os.environ.get("AAWS_INVENTORY"):
+        return os.environ["AAWS_INVENTORY"]
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache, "avtomat_aws", "inventory.db")
+
+
+def connect():
+    """Open the inventory database, creating it on first use."""
+
+    path = inventory_path()
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+
+    db = sqlite3.connect(path, timeout=30)
+    db.executescript(SCHEMA)
+    # Readers don't block the writer refreshing another region
+    db.execute("PRAGMA journal_mode=WAL")
+
+    return db
+
+
+def encode(value):
+    """Encode datetimes so records read back as they were described."""
+
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def decode(value):
+    """Decode datetimes encoded by 'encode'."""
+
+    if "__datetime__" in value:
+        return datetime.datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+def describe_resources(resource_type, session, region):
+    """Yield every resource of a type with one bulk describe pass."""
+
+    inventory_type = INVENTORY_TYPES[resource_type]
+    session_objects = set_session_objects(session, clients=["ec2"], region=region)
+
+    for item in paginate(
+        session_objects["ec2_client"],
+        inventory_type["operation"],
+        inventory_type["result_key"],
+        page_size=1000,
+        **inventory_type["params"],
+    ):
+        # Instances are described inside their reservations
+        if resource_type == "instance":
+            yield from item["Instances"]
+        else:
+            yield item
+
+
+def refresh_inventory(resource_type, **kwargs):
+    """Replace the inventory of a resource type with a fresh bulk describe pass."""
+
+    session = kwargs["session"]
+    region = kwargs["region"]
+    account = get_identity(session)["Account"]
+    inventory_type = INVENTORY_TYPES[resource_type]
+
+    logger.debug(f"Refreshing {resource_type} inventory for {account} {region}")
+
+    resources = []
+    tags = []
+    for resource in describe_resources(resource_type, session, region):
+        resource_id = resource[inventory_type["id_key"]]
+        state = resource.get(inventory_type["state_key"])
+        if isinstance(state, dict):
+            state = state["Name"]
+        resources.append(
+            (
+                account,
+                region,
+                resource_type,
+                resource_id,
+                state,
+                json.dumps(resource, default=encode),
+            )
+        )
+        for tag in resource.get("Tags", []):
+            tags.append(
+                (account, region, resource_type, resource_id, tag["Key"], tag["Value"])
+            )
+
+    key = (account, region, resource_type)
+    with closing(connect()) as db, db:
+        db.execute(
+            "DELETE FROM resources WHERE account = ? AND region = ? AND type = ?", key
+        )
+        db.execute(
+            "DELETE FROM tags WHERE account = ? AND region = ? AND type = ?", key
+        )
+        db.executemany("INSERT INTO resources VALUES (?, ?, ?, ?, ?, ?)", resources)
+        db.executemany("INSERT INTO tags VALUES (?, ?, ?, ?, ?, ?)", tags)
+        db.execute(
+            "INSERT OR REPLACE INTO inventories VALUES (?, ?, ?, ?)",
+            (*key, time.time()),
+        )
+
+    logger.debug(f"{len(resources)} {resource_type} resources inventoried")
+
+
+def is_fresh(resource_type, account, region):
+    """Check if the inventory of a resource type was refreshed within its TTL."""
+
+    with closing(connect()) as db:
+        row = db.execute(
+            "SELECT refreshed FROM inventories WHERE account = ? AND region = ? AND type = ?",
+            (account, region, resource_type),
+        ).fetchone()
+
+    return bool(row) and row[0] + INVENTORY_TYPES[resource_type]["ttl"] > time.time()
+
+
+def search_inventory(resource_type, ids=None, states=None, tags=None, **kwargs):
+    """Return describe records of a resource type from the inventory, refreshing it when stale.
+
+    Tags are dictionaries with a 'Key' and an optional 'Value', records must have all of them.
+    """
+
+    account = get_identity(kwargs["session"])["Account"]
+    region = kwargs["region"]
+
+    if not is_fresh(resource_type, account, region):
+        refresh_inventory(resource_type, **kwargs)
+    else:
+        logger.debug(f"Using {resource_type} inventory for {account} {region}")
+
+    query = "SELECT data FROM resources WHERE account = ? AND region = ? AND type = ?"
+    params = [account, region, resource_type]
+    if ids:
+        query += " AND id IN (SELECT value FROM json_each(?))"
+        params.append(json.dumps(ids))
+    if states:
+        query += " AND state IN (SELECT value FROM json_each(?))"
+        params.append(json.dumps(states))
+    for tag in tags or []:
+        query += (
+            " AND id IN (SELECT id FROM tags"
+            " WHERE account = ? AND region = ? AND type = ? AND key = ?"
+        )
+        params += [account, region, resource_type, tag["Key"]]
+        if tag.get("Value") is not None:
+            query += " AND value = ?"
+            params.append(tag["Value"])
+        query += ")"
+
+    with closing(connect()) as db:
+        rows = db.execute(query, params).fetchall()  # nosec B608
+
+    return [json.loads(row[0], object_hook=decode) for row in rows]
+
+
+def clear_inventory(region, resource_types=None):
+    """Mark inventories in a region stale so the next search describes them again."""
+
+    if not os.path.exists(inventory_path()):
+        return
+
+    resource_types = resource_types or list(INVENTORY_TYPES)
+    with closing(connect()) as db, db:
+        db.execute(
+            "DELETE FROM inventories WHERE region = ? AND type IN (SELECT value FROM json_each(?))",
+            (region, json.dumps(resource_types)),
+        )
+
+    logger.debug(f"Cleared {', '.join(resource_types)} inventory for {region}")
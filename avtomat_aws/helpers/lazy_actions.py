@@ -0,0 +1,33 @@
+import sys
+import types
+from importlib import import_module
+
+
+class ServicePackage(types.ModuleType):
+    """Service package that imports its actions on first access."""
+
+    def __getattr__(self, name):
+        if name not in self.__all__:
+            raise AttributeError(f"module '{self.__name__}' has no attribute '{name}'")
+        # Importing the action module binds the action on the package through __setattr__
+        import_module(f"{self.__name__}.{name}")
+        return self.__dict__[name]
+
+    def __setattr__(self, name, value):
+        # The import system binds submodules on their package, keep the action function instead
+        if (
+            isinstance(value, types.ModuleType)
+            and name in self.__dict__.get("__all__", [])
+            and value.__name__ == f"{self.__name__}.{name}"
+        ):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__all__))
+
+
+def lazy_actions(name):
+    """Defer importing a service package's actions, and boto3 with them, until they are used."""
+
+    sys.modules[name].__class__ = ServicePackage
@@ -0,0 +1,14 @@
+def paginate_pages(client, operation, page_size=None, **params):
+    """Yield the pages of a paginated operation as they are fetched."""
+
+    paginator = client.get_paginator(operation)
+    pagination_config = {"PageSize": page_size} if page_size else {}
+
+    yield from paginator.paginate(PaginationConfig=pagination_config, **params)
+
+
+def paginate(client, operation, result_key, page_size=None, **params):
+    """Yield the items of a paginated operation lazily, one page in memory at a time."""
+
+    for page in paginate_pages(client, operation, page_size=page_size, **params):
+        yield from page.get(result_key) or []
@@ -0,0 +1,70 @@
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def prefetch(pages, depth=None, label="Pages"):
+    """Fetch up to 'depth' pages ahead of the consumer on a background thread."""
+
+    if not depth:
+        yield from pages
+        return
+
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    stats = {"pages": 0, "fetch": 0.0}
+
+    def put(item):
+        # Give up once the consumer stops iterating
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(pages)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    page = next(iterator)
+                except StopIteration:
+                    break
+                stats["fetch"] += time.perf_counter() - start
+                stats["pages"] += 1
+                if not put(("page", page)):
+                    return
+        except Exception as e:
+            put(("error", e))
+            return
+        put(("done", None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+
+    waited = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            kind, value = buffer.get()
+            waited += time.perf_counter() - start
+            if kind == "error":
+                raise value
+            if kind == "done":
+                break
+            yield value
+    finally:
+        stop.set()
+
+    # Share of the fetch time that overlapped with processing on the consumer side
+    overlap = 1 - waited / stats["fetch"] if stats["fetch"] else 1
+    logger.debug(
+        f"{label} - prefetched {stats['pages']} pages, fetching took {stats['fetch']:.2f}s, "
+        f"waited {waited:.2f}s, overlap {max(overlap, 0):.0%}"
+    )
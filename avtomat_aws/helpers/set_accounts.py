@@ -0,0 +1,32 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def set_accounts(
+    role_arns=None, account_ids=None, role_name=None, debug=None, silent=None
+):
+    """Set the accounts and the roles to assume in them for a multi-account action."""
+
+    # Set logging level
+    if debug:
+        logger.setLevel(logging.DEBUG)
+    elif silent:
+        logger.setLevel(logging.WARNING)
+
+    accounts = {}
+    if role_arns:
+        logger.debug("Role ARNs explicitly set")
+        for role_arn in role_arns:
+            # arn:aws:iam::<account_id>:role/<role_name>
+            accounts[role_arn.split(":")[4]] = role_arn
+    if account_ids:
+        if not role_name:
+            raise ValueError("'account_ids' and 'role_name' must be used together")
+        logger.debug(f"Role ARNs built from account IDs and role '{role_name}'")
+        for account_id in account_ids:
+            accounts[account_id] = f"arn:aws:iam::{account_id}:role/{role_name}"
+
+    logger.debug(f"Accounts - {list(accounts)}")
+
+    return accounts
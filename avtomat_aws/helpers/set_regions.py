@@ -0,0 +1,32 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def set_regions(regions, session, region=None, debug=None, silent=None):
+    """Set the regions for a multi-region action."""
+
+    # Set logging level
+    if debug:
+        logger.setLevel(logging.DEBUG)
+    elif silent:
+        logger.setLevel(logging.WARNING)
+
+    if isinstance(regions, str):
+        regions = [regions]
+
+    if "all" in regions:
+        # Imported here as service modules depend on the decorators
+        from avtomat_aws.services.ec2 import discover_active_regions
+
+        logger.debug("All active regions requested")
+        regions = discover_active_regions(
+            session=session, region=region, debug=debug, silent=True
+        )
+    else:
+        # Deduplicate while keeping the supplied order
+        regions = list(dict.fromkeys(regions))
+
+    logger.debug(f"Regions - {regions}")
+
+    return regions
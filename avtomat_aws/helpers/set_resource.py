@@ -0,0 +1,9 @@
+def set_resource(service_resource, resource_type, value, id_key):
+    """Return a resource from its ID, or from its describe record without loading it again."""
+
+    if isinstance(value, dict):
+        resource = getattr(service_resource, resource_type)(value[id_key])
+        resource.meta.data = value
+        return resource
+
+    return getattr(service_resource, resource_type)(value)
@@ -1,9 +1,21 @@
+import hashlib
 import logging
+import os
+import threading
+import time
 
 import boto3
 
 logger = logging.getLogger(__name__)
 
+SESSION_TTL = 3600  # Seconds a cached session is reused for
+EXPIRY_MARGIN = 300  # Seconds before credential expiry a cached session is dropped
+
+_sessions = {}
+_credentials = {}
+_identities = {}
+_lock = threading.Lock()
+
 
 def set_session(**kwargs):
     """Set the session."""
@@ -17,15 +29,32 @@ def set_session(**kwargs):
     if kwargs.get("session"):
         logger.debug("Session explicitly supplied.")
         session = kwargs["session"]
-    elif kwargs.get("profile"):
+        identity = get_identity(session)
+        logger.debug(f"Session created: {identity['Arn']}")
+        return session
+
+    key = session_key(**kwargs)
+    session = get_cached_session(key)
+    if session:
+        identity = get_identity(session)
+        logger.debug(f"Session reused: {identity['Arn']}")
+        return session
+
+    expiration = None
+    if kwargs.get("profile"):
         session = authenticate_profile(kwargs["profile"])
     elif kwargs.get("role_arn"):
-        session = authenticate_role(
-            kwargs["role_arn"], kwargs["mfa_serial"], kwargs["mfa_token"]
+        credentials = get_role_credentials(
+            kwargs["role_arn"],
+            kwargs.get("mfa_serial"),
+            kwargs.get("mfa_token"),
+            source_session=kwargs.get("source_session"),
         )
+        session = session_from_credentials(credentials)
+        expiration = credentials["Expiration"]
     elif kwargs.get("access_key") and kwargs.get("secret_key"):
         session = authenticate_credentials(
-            kwargs["access_key"], kwargs["secret_key"], kwargs["session_token"]
+            kwargs["access_key"], kwargs["secret_key"], kwargs.get("session_token")
         )
     else:
         logger.debug(
@@ -34,13 +63,154 @@ def set_session(**kwargs):
         )
         session = authenticate_default()
 
-    sts_client = session.client("sts")
-    response = sts_client.get_caller_identity()
-    logger.debug(f"Session created: {response['Arn']}")
+    identity = get_identity(session)
+    logger.debug(f"Session created: {identity['Arn']}")
+
+    cache_session(key, session, expiration)
 
     return session
 
 
+def session_key(**kwargs):
+    """Build the cache key for the authentication parameters."""
+
+    region = kwargs.get("region")
+
+    if kwargs.get("profile"):
+        return ("profile", kwargs["profile"], region)
+    if kwargs.get("role_arn"):
+        return (
+            "role",
+            kwargs["role_arn"],
+            kwargs.get("mfa_serial"),
+            source_key(kwargs.get("source_session")),
+            region,
+        )
+    if kwargs.get("access_key") and kwargs.get("secret_key"):
+        fingerprint = credentials_fingerprint(
+            kwargs["access_key"], kwargs["secret_key"], kwargs.get("session_token")
+        )
+        return ("credentials", fingerprint, region)
+
+    # Default credentials depend on the environment, which can change between calls
+    fingerprint = credentials_fingerprint(
+        os.environ.get("AWS_ACCESS_KEY_ID"),
+        os.environ.get("AWS_SECRET_ACCESS_KEY"),
+        os.environ.get("AWS_SESSION_TOKEN"),
+    )
+    return ("default", os.environ.get("AWS_PROFILE"), fingerprint, region)
+
+
+def source_key(source_session=None):
+    """Build the cache key for the credentials a role is assumed with."""
+
+    # Roles are assumed with default credentials unless a source session is supplied
+    if source_session is None:
+        return session_key()
+
+    credentials = source_session.get_credentials()
+    if credentials is None:
+        return ("source", None)
+    frozen = credentials.get_frozen_credentials()
+    return (
+        "source",
+        credentials_fingerprint(frozen.access_key, frozen.secret_key, frozen.token),
+    )
+
+
+def credentials_fingerprint(access_key, secret_key, session_token=None):
+    """Return a digest identifying a set of credentials without storing them."""
+
+    material = f"{access_key}:{secret_key}:{session_token}".encode()
+    return hashlib.sha256(material).hexdigest()
+
+
+def get_cached_session(key):
+    """Return a cached session if it exists and hasn't expired."""
+
+    with _lock:
+        entry = _sessions.get(key)
+        if not entry:
+            return None
+        if entry["expires"] <= time.time():
+            logger.debug("Cached session expired, re-authenticating.")
+            del _sessions[key]
+            return None
+        return entry["session"]
+
+
+def cache_session(key, session, expiration=None):
+    """Cache a session until the TTL or its credential expiry, whichever is sooner."""
+
+    expires = time.time() + SESSION_TTL
+    if expiration:
+        expires = min(expires, expiration.timestamp() - EXPIRY_MARGIN)
+
+    with _lock:
+        _sessions[key] = {"session": session, "expires": expires}
+
+
+def get_role_credentials(
+    role_arn, mfa_serial=None, mfa_token=None, source_session=None
+):
+    """Return cached credentials for a role, assuming it again shortly before they expire."""
+
+    # A different source identity mustn't reuse the role credentials assumed with another
+    key = (role_arn, mfa_serial, source_key(source_session))
+    with _lock:
+        credentials = _credentials.get(key)
+    if (
+        credentials
+        and credentials["Expiration"].timestamp() - EXPIRY_MARGIN > time.time()
+    ):
+        return credentials
+
+    credentials = assume_role(role_arn, mfa_serial, mfa_token, source_session)
+    with _lock:
+        _credentials[key] = credentials
+
+    return credentials
+
+
+def clear_sessions():
+    """Drop all cached sessions, credentials and identities."""
+
+    with _lock:
+        _sessions.clear()
+        _credentials.clear()
+        _identities.clear()
+
+
+def get_identity(session):
+    """Return the caller identity of a session, resolved once per set of credentials."""
+
+    credentials = session.get_credentials()
+    if credentials is None:
+        # Let STS raise the appropriate 'no credentials' error
+        return session.client("sts").get_caller_identity()
+
+    frozen = credentials.get_frozen_credentials()
+    fingerprint = credentials_fingerprint(
+        frozen.access_key, frozen.secret_key, frozen.token
+    )
+
+    with _lock:
+        identity = _identities.get(fingerprint)
+    if identity:
+        return identity
+
+    response = session.client("sts").get_caller_identity()
+    identity = {
+        "Arn": response["Arn"],
+        "UserId": response["UserId"],
+        "Account": response["Account"],
+    }
+    with _lock:
+        _identities[fingerprint] = identity
+
+    return identity
+
+
 def authenticate_credentials(access_key, secret_key, session_token=None):
     """Authenticate with credentials"""
 
@@ -60,13 +230,21 @@ def authenticate_profile(profile_name):
 def authenticate_role(role_arn, mfa_serial=None, mfa_token=None):
     """Authenticate by assuming a role"""
 
-    sts_client = boto3.client("sts")
-    response = sts_client.get_caller_identity()
-    if ":" in response["UserId"]:
-        parts = response["UserId"].split(":")
+    credentials = assume_role(role_arn, mfa_serial, mfa_token)
+
+    return session_from_credentials(credentials)
+
+
+def assume_role(role_arn, mfa_serial=None, mfa_token=None, source_session=None):
+    """Assume a role and return its temporary credentials"""
+
+    source_session = source_session or boto3.Session()
+    identity = get_identity(source_session)
+    if ":" in identity["UserId"]:
+        parts = identity["UserId"].split(":")
         user = parts[1]
     else:
-        user = response["UserId"]
+        user = identity["UserId"]
 
     assume_role_kwargs = {
         "RoleArn": role_arn,
@@ -77,8 +255,14 @@ def authenticate_role(role_arn, mfa_serial=None, mfa_token=None):
         assume_role_kwargs["SerialNumber"] = mfa_serial
         assume_role_kwargs["TokenCode"] = mfa_token
 
+    sts_client = source_session.client("sts")
     response = sts_client.assume_role(**assume_role_kwargs)
-    credentials = response["Credentials"]
+
+    return response["Credentials"]
+
+
+def session_from_credentials(credentials):
+    """Create a session from temporary credentials returned by STS"""
 
     return boto3.Session(
         aws_access_key_id=credentials["AccessKeyId"],
@@ -1,4 +1,6 @@
 import logging
+import threading
+from collections import OrderedDict
 
 from botocore.config import Config
 
@@ -7,22 +9,76 @@ logger = logging.getLogger(__name__)
 
 config = Config(retries={"max_attempts": 5, "mode": "standard"})
 
+POOL_SIZE = 128  # Maximum number of pooled clients and resources
 
-def set_session_objects(session, region, clients=None, resources=None):
+_pool = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_lock = threading.Lock()
+
+
+def set_session_objects(session, region, clients=None, resources=None, config=config):
     """Set the session objects(clients and resources)."""
 
     session_objects = {}
 
     if clients:
         for client in clients:
-            session_objects[f"{client}_client"] = session.client(
-                client, region_name=region, config=config
+            session_objects[f"{client}_client"] = get_pooled(
+                session, "client", client, region, config
             )
 
     if resources:
         for resource in resources:
-            session_objects[f"{resource}_resource"] = session.resource(
-                resource, region_name=region, config=config
+            session_objects[f"{resource}_resource"] = get_pooled(
+                session, "resource", resource, region, config
             )
 
     return session_objects
+
+
+def get_pooled(session, kind, service, region, config):
+    """Return a pooled client or resource, creating it on a miss."""
+
+    # Clients are thread-safe and shared, resources are not and are pooled per thread
+    thread = threading.get_ident() if kind == "resource" else None
+    key = (id(session), kind, service, region, id(config), thread)
+
+    with _lock:
+        entry = _pool.get(key)
+        if entry:
+            _pool.move_to_end(key)
+            _stats["hits"] += 1
+            return entry["object"]
+
+        _stats["misses"] += 1
+        # Session objects aren't thread-safe, so creation happens under the lock
+        if kind == "client":
+            obj = session.client(service, region_name=region, config=config)
+        else:
+            obj = session.resource(service, region_name=region, config=config)
+
+        # Keep references to the session and config so their ids aren't reused
+        _pool[key] = {"object": obj, "session": session, "config": config}
+        if len(_pool) > POOL_SIZE:
+            _pool.popitem(last=False)
+            _stats["evictions"] += 1
+
+    logger.debug(f"Created {service} {kind} for {region}")
+
+    return obj
+
+
+def pool_stats():
+    """Return client and resource pool counters."""
+
+    with _lock:
+        return {**_stats, "size": len(_pool)}
+
+
+def clear_session_objects():
+    """Drop all pooled clients and resources and reset the counters."""
+
+    with _lock:
+        _pool.clear()
+        for counter in _stats:
+            _stats[counter] = 0
@@ -0,0 +1,84 @@
+import logging
+
+from avtomat_aws.helpers.paginate import paginate
+from avtomat_aws.helpers.set_session_objects import set_session_objects
+
+logger = logging.getLogger(__name__)
+
+
+def describe_sgs(session, region):
+    """Return all security groups and their rules."""
+
+    session_objects = set_session_objects(session, clients=["ec2"], region=region)
+
+    return list(
+        paginate(
+            session_objects["ec2_client"],
+            "describe_security_groups",
+            "SecurityGroups",
+            page_size=1000,
+        )
+    )
+
+
+def build_sg_graph(sgs):
+    """Map each security group to the security groups its ingress and egress rules reference."""
+
+    graph = {}
+    for sg in sgs:
+        graph[sg["GroupId"]] = {
+            pair["GroupId"]
+            for permission in sg.get("IpPermissions", [])
+            + sg.get("IpPermissionsEgress", [])
+            for pair in permission.get("UserIdGroupPairs", [])
+            if pair.get("GroupId") and pair["GroupId"] != sg["GroupId"]
+        }
+
+    return graph
+
+
+def list_referenced_sgs(graph, sg_ids):
+    """Return security groups referenced, directly or transitively, by the supplied ones."""
+
+    sg_ids = set(sg_ids)
+    referenced_sgs = set()
+    pending = list(sg_ids)
+    while pending:
+        for referenced_sg in graph.get(pending.pop(), set()):
+            if referenced_sg not in sg_ids and referenced_sg not in referenced_sgs:
+                referenced_sgs.add(referenced_sg)
+                pending.append(referenced_sg)
+
+    return referenced_sgs
+
+
+def list_referencing_sgs(graph, sg_id):
+    """Return security groups whose rules reference the supplied one."""
+
+    return {group for group, references in graph.items() if sg_id in references}
+
+
+def order_sg_deletion(graph, sg_ids):
+    """Split security groups into batches that can be deleted in order, referencing groups first."""
+
+    remaining = list(dict.fromkeys(sg_ids))
+    batches = []
+    while remaining:
+        # A group can go once no remaining group references it
+        referenced = set()
+        for sg_id in remaining:
+            referenced.update(graph.get(sg_id, set()))
+        batch = [sg_id for sg_id in remaining if sg_id not in referenced]
+
+        if not batch:
+            logger.warning(
+                f"{len(remaining)} security groups reference each other in a cycle"
+            )
+            logger.debug(remaining)
+            batches.append(remaining)
+            break
+
+        batches.append(batch)
+        remaining = [sg_id for sg_id in remaining if sg_id in referenced]
+
+    return batches
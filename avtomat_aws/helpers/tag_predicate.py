@@ -0,0 +1,79 @@
+import re
+
+WILDCARDS = "*?"
+MISSING = object()
+
+
+def compile_pattern(pattern):
+    """Return a function matching a string against a pattern with '*' and '?' wildcards"""
+
+    if not any(wildcard in pattern for wildcard in WILDCARDS):
+        return pattern.__eq__
+
+    # Prefixes, e.g. 'prod-*', don't need a regular expression
+    prefix = pattern[:-1]
+    if pattern.endswith("*") and not any(wildcard in prefix for wildcard in WILDCARDS):
+        return lambda value: value.startswith(prefix)
+
+    expression = "".join(
+        ".*" if char == "*" else "." if char == "?" else re.escape(char)
+        for char in pattern
+    )
+    return re.compile(expression, re.DOTALL).fullmatch
+
+
+def compile_tags(tags, missing=False):
+    """Compile tags into a predicate over describe tag lists, e.g. [{"Key": "Env", "Value": "prod"}].
+
+    The predicate is true for tag lists that have every tag, or with 'missing' for ones that don't.
+    Keys and values may contain '*' and '?' wildcards.
+    """
+
+    wanted = {}  # Exact keys mapped to their exact value, or None for any value
+    patterns = []  # Keys or values with wildcards
+    conflicting = False  # The same key is required with different values
+    for tag in tags:
+        key, value = tag["Key"], tag.get("Value")
+        if any(wildcard in key + (value or "") for wildcard in WILDCARDS):
+            patterns.append(
+                (
+                    compile_pattern(key),
+                    compile_pattern(value) if value is not None else None,
+                )
+            )
+        elif wanted.get(key) is None:
+            wanted[key] = value
+        elif value is not None and value != wanted[key]:
+            conflicting = True
+
+    required = len(wanted)
+    expected_value = wanted.get
+
+    def has_exact_tags(resource_tags):
+        # Resource tag keys are unique, so counting the wanted ones found is enough
+        found = 0
+        for tag in resource_tags or []:
+            expected = expected_value(tag["Key"], MISSING)
+            if expected is not MISSING and (
+                expected is None or expected == tag.get("Value")
+            ):
+                found += 1
+        return found == required
+
+    def has_tags(resource_tags):
+        if conflicting or not has_exact_tags(resource_tags):
+            return False
+        if not patterns:
+            return True
+        return all(
+            any(
+                match_key(tag["Key"])
+                and (match_value is None or match_value(tag.get("Value") or ""))
+                for tag in resource_tags or []
+            )
+            for match_key, match_value in patterns
+        )
+
+    if missing:
+        return lambda resource_tags: not has_tags(resource_tags)
+    return has_tags
@@ -0,0 +1,92 @@
+import logging
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+from avtomat_aws.helpers.fan_out import fan_out
+
+logger = logging.getLogger(__name__)
+
+# EC2 mutating API token bucket: 50 requests burst, refilled at 5 per second
+EC2_MUTATING_RATE = 5
+EC2_MUTATING_BURST = 50
+# AWS Backup control plane calls, throttled well below EC2, kept conservative as quotas aren't published
+BACKUP_RATE = 2
+BACKUP_BURST = 5
+
+THROTTLE_ERRORS = {
+    "RequestLimitExceeded",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+}
+RETRIES = 5  # Retries on top of botocore's own once a call is still throttled
+BACKOFF = 1  # Seconds, doubled on every retry
+PROGRESS_INTERVAL = 100  # Items between progress messages
+
+
+def rate_limiter(rate, burst):
+    """Return a function that blocks until a token bucket allows another call."""
+
+    lock = threading.Lock()
+    bucket = {"tokens": burst, "updated": time.monotonic()}
+
+    def acquire():
+        while True:
+            with lock:
+                now = time.monotonic()
+                bucket["tokens"] = min(
+                    burst, bucket["tokens"] + (now - bucket["updated"]) * rate
+                )
+                bucket["updated"] = now
+                if bucket["tokens"] >= 1:
+                    bucket["tokens"] -= 1
+                    return
+                wait = (1 - bucket["tokens"]) / rate
+            time.sleep(wait)
+
+    return acquire
+
+
+def call_with_backoff(func, *args, **kwargs):
+    """Call an AWS API, backing off exponentially while it is throttled."""
+
+    for attempt in range(RETRIES + 1):
+        try:
+            return func(*args, **kwargs)
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in THROTTLE_ERRORS or attempt == RETRIES:
+                raise
+            delay = BACKOFF * 2**attempt
+            logger.debug(f"Throttled, retrying in {delay}s")
+            time.sleep(delay)
+
+
+def run_throttled(
+    task,
+    items,
+    rate=EC2_MUTATING_RATE,
+    burst=EC2_MUTATING_BURST,
+    workers=None,
+    label="Item",
+):
+    """Run a task for each item concurrently within a rate limit, return results and failures keyed by item."""
+
+    items = list(items)
+    acquire = rate_limiter(rate, burst)
+    lock = threading.Lock()
+    progress = {"processed": 0}
+
+    def run(item):
+        try:
+            acquire()
+            return call_with_backoff(task, item)
+        finally:
+            with lock:
+                progress["processed"] += 1
+                processed = progress["processed"]
+            if processed % PROGRESS_INTERVAL == 0:
+                logger.info(f"{processed}/{len(items)} processed")
+
+    return fan_out(run, items, workers=workers, label=label)
@@ -1,2 +1,8 @@
-from .create_backups import create_backups
-from .delete_backups import delete_backups
+from avtomat_aws.helpers.lazy_actions import lazy_actions
+
+__all__ = [
+    "create_backups",
+    "delete_backups",
+]
+
+lazy_actions(__name__)
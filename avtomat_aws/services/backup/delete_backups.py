@@ -4,6 +4,7 @@ from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import BACKUP_BURST, BACKUP_RATE, run_throttled
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +16,15 @@ RULES = [{"required": ["backup_vault_name", "recovery_point_arns"]}]
 @set_logger()
 @authenticate()
 def delete_backups(**kwargs):
-    """Delete backup recovery points"""
+    """Delete backup recovery points, each ARN once even if it's listed several times"""
 
     # Required parameters
     backup_vault_name = kwargs.pop("backup_vault_name")
     recovery_point_arns = kwargs.pop("recovery_point_arns")
 
+    # Results are keyed by ARN, so duplicates are dropped rather than deleted twice
+    recovery_point_arns = list(dict.fromkeys(recovery_point_arns))
+
     if not recovery_point_arns:
         logger.info("No recovery points to delete")
         return []
@@ -31,18 +35,22 @@ def delete_backups(**kwargs):
 
     logger.info(f"Deleting recovery points from '{backup_vault_name}' backup vault")
 
-    failed = []
-    counter = 0
-    for arn in recovery_point_arns:
-        try:
-            session_objects["backup_client"].delete_recovery_point(
-                BackupVaultName=backup_vault_name, RecoveryPointArn=arn
-            )
-            logger.info(f"{arn} - deleted")
-            counter += 1
-        except Exception as e:
-            failed.append(arn)
-            logger.error(f"{arn} - failed to delete - {e}")
+    def delete(arn):
+        session_objects["backup_client"].delete_recovery_point(
+            BackupVaultName=backup_vault_name, RecoveryPointArn=arn
+        )
+        logger.info(f"{arn} - deleted")
+
+    deleted, failed = run_throttled(
+        delete,
+        recovery_point_arns,
+        rate=BACKUP_RATE,
+        burst=BACKUP_BURST,
+        workers=kwargs.get("workers"),
+        label="Recovery point",
+    )
+    counter = len(deleted)
+    failed = list(failed)
 
     logger.info(f"{counter} recovery points deleted")
     if failed:
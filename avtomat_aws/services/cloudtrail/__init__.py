@@ -1,3 +1,9 @@
-from .discover_events import discover_events
-from .discover_resource_events import discover_resource_events
-from .discover_user_events import discover_user_events
+from avtomat_aws.helpers.lazy_actions import lazy_actions
+
+__all__ = [
+    "discover_events",
+    "discover_resource_events",
+    "discover_user_events",
+]
+
+lazy_actions(__name__)
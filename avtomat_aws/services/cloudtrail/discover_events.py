@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.paginate import paginate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
@@ -11,6 +12,7 @@ logger = logging.getLogger(__name__)
 DEFAULTS = {
     "created_after": datetime.now() - timedelta(days=90),
     "created_before": datetime.now(),
+    "stream": False,
     "region": None,
     "debug": False,
     "silent": False,
@@ -24,7 +26,7 @@ RULES = [
 
 @validate(DEFAULTS, RULES)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_events(**kwargs):
     """Discover events by name"""
 
@@ -42,6 +44,12 @@ def discover_events(**kwargs):
 
     events = search_events(event, **kwargs)
 
+    if kwargs.get("stream"):
+        logger.info("Streaming events")
+        return events
+
+    events = list(events)
+
     logger.info(f"{len(events)} events found")
     logger.debug(events)
 
@@ -59,36 +67,19 @@ def search_events(event, **kwargs):
     session_objects = set_session_objects(
         session, clients=["cloudtrail"], region=region
     )
-    events = []
 
-    response = session_objects["cloudtrail_client"].lookup_events(
+    for obj in paginate(
+        session_objects["cloudtrail_client"],
+        "lookup_events",
+        "Events",
+        page_size=50,
         LookupAttributes=[{"AttributeKey": "EventName", "AttributeValue": event}],
         StartTime=created_after,
         EndTime=created_before,
-    )
-
-    while True:
-        for obj in response["Events"]:
-            data = {
-                "UserName": obj["Username"],
-                "EventTime": obj["EventTime"].isoformat(),
-                "EventName": obj["EventName"],
-                "Resources": [
-                    resource["ResourceName"] for resource in obj["Resources"]
-                ],
-            }
-            events.append(data)
-
-        if response.get("NextToken"):
-            response = session_objects["cloudtrail_client"].lookup_events(
-                LookupAttributes=[
-                    {"AttributeKey": "EventName", "AttributeValue": event}
-                ],
-                StartTime=created_after,
-                EndTime=created_before,
-                NextToken=response["NextToken"],
-            )
-        else:
-            break
-
-    return events
+    ):
+        yield {
+            "UserName": obj["Username"],
+            "EventTime": obj["EventTime"].isoformat(),
+            "EventName": obj["EventName"],
+            "Resources": [resource["ResourceName"] for resource in obj["Resources"]],
+        }
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.paginate import paginate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
@@ -12,6 +13,7 @@ DEFAULTS = {
     "events": [],
     "created_after": datetime.now() - timedelta(days=90),
     "created_before": datetime.now(),
+    "stream": False,
     "region": None,
     "debug": False,
     "silent": False,
@@ -25,7 +27,7 @@ RULES = [
 
 @validate(DEFAULTS, RULES)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_user_events(**kwargs):
     """Discover events created by specific user"""
 
@@ -44,6 +46,12 @@ def discover_user_events(**kwargs):
     unfiltered_events = search_events(user, **kwargs)
     events = filter_events(unfiltered_events, **kwargs)
 
+    if kwargs.get("stream"):
+        logger.info("Streaming events")
+        return events
+
+    events = list(events)
+
     logger.info(f"{len(events)} events found")
     logger.debug(events)
 
@@ -61,37 +69,22 @@ def search_events(user, **kwargs):
     session_objects = set_session_objects(
         session, clients=["cloudtrail"], region=region
     )
-    events = []
 
-    response = session_objects["cloudtrail_client"].lookup_events(
+    for event in paginate(
+        session_objects["cloudtrail_client"],
+        "lookup_events",
+        "Events",
+        page_size=50,
         LookupAttributes=[{"AttributeKey": "Username", "AttributeValue": user}],
         StartTime=created_after,
         EndTime=created_before,
-    )
-
-    while True:
-        for event in response["Events"]:
-            data = {
-                "UserName": event["Username"],
-                "EventTime": event["EventTime"].isoformat(),
-                "EventName": event["EventName"],
-                "Resources": [
-                    resource["ResourceName"] for resource in event["Resources"]
-                ],
-            }
-            events.append(data)
-
-        if response.get("NextToken"):
-            response = session_objects["cloudtrail_client"].lookup_events(
-                LookupAttributes=[{"AttributeKey": "Username", "AttributeValue": user}],
-                StartTime=created_after,
-                EndTime=created_before,
-                NextToken=response["NextToken"],
-            )
-        else:
-            break
-
-    return events
+    ):
+        yield {
+            "UserName": event["Username"],
+            "EventTime": event["EventTime"].isoformat(),
+            "EventName": event["EventName"],
+            "Resources": [resource["ResourceName"] for resource in event["Resources"]],
+        }
 
 
 def filter_events(unfiltered_events, **kwargs):
@@ -102,8 +95,8 @@ def filter_events(unfiltered_events, **kwargs):
 
     if events:
         logger.debug(f"Filtering for events: {events}")
-        filtered_events = [
+        filtered_events = (
             event for event in filtered_events if event["EventName"] in events
-        ]
+        )
 
     return filtered_events
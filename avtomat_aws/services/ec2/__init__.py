@@ -1,23 +1,29 @@
-from .copy_snapshots import copy_snapshots
-from .create_images import create_images
-from .create_snapshots import create_snapshots
-from .delete_images import delete_images
-from .delete_instances import delete_instances
-from .delete_security_groups import delete_security_groups
-from .delete_snapshots import delete_snapshots
-from .delete_volumes import delete_volumes
-from .discover_active_regions import discover_active_regions
-from .discover_default_ebs_encryption import discover_default_ebs_encryption
-from .discover_images import discover_images
-from .discover_instances import discover_instances
-from .discover_no_ssm_instances import discover_no_ssm_instances
-from .discover_snapshots import discover_snapshots
-from .discover_tags import discover_tags
-from .discover_unused_security_groups import discover_unused_security_groups
-from .discover_volumes import discover_volumes
-from .encrypt_instance_volumes import encrypt_instance_volumes
-from .encrypt_volume import encrypt_volume
-from .modify_default_ebs_encryption import modify_default_ebs_encryption
-from .modify_tags import modify_tags
-from .modify_volumes import modify_volumes
-from .share_snapshots import share_snapshots
+from avtomat_aws.helpers.lazy_actions import lazy_actions
+
+__all__ = [
+    "copy_snapshots",
+    "create_images",
+    "create_snapshots",
+    "delete_images",
+    "delete_instances",
+    "delete_security_groups",
+    "delete_snapshots",
+    "delete_volumes",
+    "discover_active_regions",
+    "discover_default_ebs_encryption",
+    "discover_images",
+    "discover_instances",
+    "discover_no_ssm_instances",
+    "discover_snapshots",
+    "discover_tags",
+    "discover_unused_security_groups",
+    "discover_volumes",
+    "encrypt_instance_volumes",
+    "encrypt_volume",
+    "modify_default_ebs_encryption",
+    "modify_tags",
+    "modify_volumes",
+    "share_snapshots",
+]
+
+lazy_actions(__name__)
@@ -2,6 +2,7 @@ import logging
 import time
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
@@ -22,6 +23,7 @@ RULES = [{"and": ["encrypt", "kms_key_id"]}]
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory(["snapshot"])
 def copy_snapshots(**kwargs):
     """Move EC2 snapshots between regions or accounts"""
 
@@ -2,6 +2,7 @@ import logging
 import uuid
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
@@ -15,6 +16,7 @@ RULES = [{"required": ["instance_ids"]}]
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory(["image", "snapshot"])
 def create_images(**kwargs):
     """Create EC2 images (AMI)"""
 
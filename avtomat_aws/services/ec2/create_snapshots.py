@@ -1,8 +1,10 @@
 import logging
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.set_resource import set_resource
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,7 @@ RULES = [{"required": ["volume_ids"]}]
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory(["snapshot"])
 def create_snapshots(**kwargs):
     """Create EBS snapshots from volumes"""
 
@@ -34,7 +37,10 @@ def create_snapshots(**kwargs):
     failed = []
     for volume_id in volume_ids:
         try:
-            volume = session_objects["ec2_resource"].Volume(volume_id)
+            volume = set_resource(
+                session_objects["ec2_resource"], "Volume", volume_id, "VolumeId"
+            )
+            volume_id = volume.id
             snapshot = volume.create_snapshot(
                 Description=f"Snapshot of {volume_id}",
                 TagSpecifications=[
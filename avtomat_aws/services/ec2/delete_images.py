@@ -1,9 +1,11 @@
 import logging
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import run_throttled
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,7 @@ RULES = [{"required": ["image_ids"]}]
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory(["image", "snapshot"])
 def delete_images(**kwargs):
     """Delete EC2 images (AMI)"""
 
@@ -25,7 +28,7 @@ def delete_images(**kwargs):
         return []
 
     session_objects = set_session_objects(
-        kwargs["session"], resources=["ec2"], region=kwargs["region"]
+        kwargs["session"], clients=["ec2"], region=kwargs["region"]
     )
 
     if kwargs.get("include_snapshots"):
@@ -33,25 +36,30 @@ def delete_images(**kwargs):
     else:
         logger.info(f"Deleting images")
 
-    snapshot_ids = []
-    failed = []
-    counter = 0
-    for image_id in image_ids:
-        try:
-            image = session_objects["ec2_resource"].Image(image_id)
-            if kwargs.get("include_snapshots"):
-                for block_device in image.block_device_mappings:
-                    if "Ebs" in block_device:
-                        snapshot_ids.append(block_device["Ebs"]["SnapshotId"])
-            image.deregister()
-            counter += 1
-            logger.info(f"{image_id} - deleted")
-        except Exception as e:
-            failed.append(image_id)
-            logger.error(f"{image_id} - failed to delete - {e}")
+    def delete(image_id):
+        snapshot_ids = []
+        if kwargs.get("include_snapshots"):
+            response = session_objects["ec2_client"].describe_images(
+                ImageIds=[image_id]
+            )
+            for block_device in response["Images"][0]["BlockDeviceMappings"]:
+                if "Ebs" in block_device and "SnapshotId" in block_device["Ebs"]:
+                    snapshot_ids.append(block_device["Ebs"]["SnapshotId"])
+        session_objects["ec2_client"].deregister_image(ImageId=image_id)
+        logger.info(f"{image_id} - deleted")
+        return snapshot_ids
+
+    deleted, failed = run_throttled(
+        delete, image_ids, workers=kwargs.get("workers"), label="Image"
+    )
+    counter = len(deleted)
+    failed = list(failed)
 
+    snapshot_ids = [
+        snapshot_id for snapshots in deleted.values() for snapshot_id in snapshots
+    ]
     if snapshot_ids:
-        delete_snapshots(snapshot_ids, session_objects)
+        delete_snapshots(snapshot_ids, session_objects, kwargs.get("workers"))
 
     logger.info(f"{counter} images deleted")
     if failed:
@@ -61,13 +69,11 @@ def delete_images(**kwargs):
     return failed
 
 
-def delete_snapshots(snapshot_ids, session_objects):
+def delete_snapshots(snapshot_ids, session_objects, workers=None):
     """Delete EBS snapshots"""
 
-    for snapshot_id in snapshot_ids:
-        try:
-            snapshot = session_objects["ec2_resource"].Snapshot(snapshot_id)
-            snapshot.delete()
-            logger.debug(f"{snapshot_id} - deleted")
-        except Exception as e:
-            logger.error(f"{snapshot_id} - failed to delete - {e}")
+    def delete(snapshot_id):
+        session_objects["ec2_client"].delete_snapshot(SnapshotId=snapshot_id)
+        logger.debug(f"{snapshot_id} - deleted")
+
+    run_throttled(delete, snapshot_ids, workers=workers, label="Snapshot")
@@ -5,8 +5,10 @@ import uuid
 from botocore.exceptions import ClientError, WaiterError
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.set_resource import set_resource
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
@@ -32,6 +34,7 @@ RULES = [
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory(["instance", "volume", "image", "snapshot"])
 def delete_instances(**kwargs):
     """Delete EC2 instances"""
 
@@ -47,12 +50,15 @@ def delete_instances(**kwargs):
     )
     failed = {"Instances": [], "Volumes": [], "Images": [], "Snapshots": []}
 
-    # Get instance objects
+    # Get instance objects, describe records are reloaded as their state decides what is stopped
     instances = []
     for instance_id in instance_ids:
         try:
-            instance = session_objects["ec2_resource"].Instance(instance_id)
-            useless = instance.state  # Check if instance exists
+            instance = set_resource(
+                session_objects["ec2_resource"], "Instance", instance_id, "InstanceId"
+            )
+            instance_id = instance.id
+            instance.reload()  # Check if instance exists
             instances.append(instance)
         except Exception as e:
             failed["Instances"].append(instance_id)
@@ -3,7 +3,14 @@ import logging
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.fan_out import fan_out
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.sg_graph import (
+    build_sg_graph,
+    describe_sgs,
+    list_referencing_sgs,
+    order_sg_deletion,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,18 +37,48 @@ def delete_security_groups(**kwargs):
 
     logger.info(f"Deleting security groups")
 
+    # Delete groups referenced by other groups' rules only after the referencing groups
+    graph = build_sg_graph(describe_sgs(kwargs["session"], kwargs["region"]))
+    batches = order_sg_deletion(graph, security_group_ids)
+    logger.debug(f"Deleting in {len(batches)} batches")
+
+    def delete(security_group_id):
+        session_objects["ec2_client"].delete_security_group(GroupId=security_group_id)
+        logger.info(f"{security_group_id} - deleted")
+
     failed = []
     counter = 0
-    for security_group_id in security_group_ids:
-        try:
-            session_objects["ec2_client"].delete_security_group(
-                GroupId=security_group_id
-            )
-            counter += 1
-            logger.info(f"{security_group_id} - deleted")
-        except Exception as e:
+    for batch in batches:
+        # Groups still referenced by a group that failed, or was skipped, would fail too
+        blocked = set()
+        for security_group_id in failed:
+            blocked.update(graph.get(security_group_id, set()))
+        for security_group_id in batch:
+            if security_group_id in blocked:
+                failed.append(security_group_id)
+                logger.error(
+                    f"{security_group_id} - skipped, referenced by a security group that wasn't deleted"
+                )
+        batch = [
+            security_group_id
+            for security_group_id in batch
+            if security_group_id not in blocked
+        ]
+
+        results, batch_failed = fan_out(
+            delete, batch, workers=kwargs.get("workers"), label="Security group"
+        )
+        counter += len(results)
+        for security_group_id in batch_failed:
             failed.append(security_group_id)
-            logger.error(f"{security_group_id} - failed to delete - {e}")
+            referencing_sgs = list_referencing_sgs(graph, security_group_id)
+            if referencing_sgs:
+                logger.debug(
+                    f"{security_group_id} - referenced by {sorted(referencing_sgs)}"
+                )
+        # Deleted groups no longer reference anything
+        for security_group_id in results:
+            graph.pop(security_group_id, None)
 
     logger.info(f"{counter} security groups deleted")
     if failed:
@@ -1,9 +1,11 @@
 import logging
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import run_throttled
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,7 @@ RULES = [{"required": ["snapshot_ids"]}]
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory(["snapshot"])
 def delete_snapshots(**kwargs):
     """Delete EBS snapshots"""
 
@@ -25,22 +28,20 @@ def delete_snapshots(**kwargs):
         return []
 
     session_objects = set_session_objects(
-        kwargs["session"], resources=["ec2"], region=kwargs["region"]
+        kwargs["session"], clients=["ec2"], region=kwargs["region"]
     )
 
     logger.info(f"Deleting snapshots")
 
-    failed = []
-    counter = 0
-    for snapshot_id in snapshot_ids:
-        try:
-            snapshot = session_objects["ec2_resource"].Snapshot(snapshot_id)
-            snapshot.delete()
-            counter += 1
-            logger.info(f"{snapshot_id} - deleted")
-        except Exception as e:
-            failed.append(snapshot_id)
-            logger.error(f"{snapshot_id} - failed to delete - {e}")
+    def delete(snapshot_id):
+        session_objects["ec2_client"].delete_snapshot(SnapshotId=snapshot_id)
+        logger.info(f"{snapshot_id} - deleted")
+
+    deleted, failed = run_throttled(
+        delete, snapshot_ids, workers=kwargs.get("workers"), label="Snapshot"
+    )
+    counter = len(deleted)
+    failed = list(failed)
 
     logger.info(f"{counter} snapshots deleted")
     if failed:
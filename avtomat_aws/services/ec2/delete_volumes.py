@@ -1,9 +1,11 @@
 import logging
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import run_throttled
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,7 @@ RULES = [{"required": ["volume_ids"]}]
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory(["volume", "snapshot"])
 def delete_volumes(**kwargs):
     """Delete EBS volumes"""
 
@@ -25,7 +28,7 @@ def delete_volumes(**kwargs):
         return []
 
     session_objects = set_session_objects(
-        kwargs["session"], resources=["ec2"], region=kwargs["region"]
+        kwargs["session"], clients=["ec2"], resources=["ec2"], region=kwargs["region"]
     )
 
     logger.info(f"Deleting volumes")
@@ -59,20 +62,19 @@ def delete_volumes(**kwargs):
     for snapshot in snapshots_to_wait:
         snapshot.wait_until_completed()
 
-    failed = []
-    counter = 0
-    for volume_id in volume_ids:
-        try:
-            volume = session_objects["ec2_resource"].Volume(volume_id)
-            if volume.state != "available":
-                continue
-            volume.delete()
-            counter += 1
-            logger.info(f"{volume_id} - deleted")
-        except Exception as e:
-            failed.append(volume_id)
-            logger.error(f"{volume_id} - failed to delete - {e}")
-            continue
+    def delete(volume_id):
+        response = session_objects["ec2_client"].describe_volumes(VolumeIds=[volume_id])
+        if response["Volumes"][0]["State"] != "available":
+            return False
+        session_objects["ec2_client"].delete_volume(VolumeId=volume_id)
+        logger.info(f"{volume_id} - deleted")
+        return True
+
+    results, failed = run_throttled(
+        delete, volume_ids, workers=kwargs.get("workers"), label="Volume"
+    )
+    counter = sum(results.values())
+    failed = list(failed)
 
     logger.info(f"{counter} volumes deleted")
     if failed:
@@ -12,7 +12,7 @@ DEFAULTS = {"region": None, "debug": False, "silent": False}
 
 @validate(DEFAULTS)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_default_ebs_encryption(**kwargs):
     """Discover the default EBS encryption setting"""
 
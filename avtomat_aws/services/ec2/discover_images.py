@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.paginate import paginate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,8 @@ DEFAULTS = {
     "exclude_aws_backup": False,
     "created_before": None,
     "created_after": None,
+    "detail": False,
+    "stream": False,
     "region": None,
     "debug": False,
     "silent": False,
@@ -23,7 +26,7 @@ RULES = [{"date_yymmdd": ["created_before", "created_after"]}]
 
 @validate(DEFAULTS, RULES)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_images(**kwargs):
     """Discover images based on provided criteria"""
 
@@ -39,6 +42,12 @@ def discover_images(**kwargs):
     filters = build_filters(**kwargs)
     images = search_images(filters, **kwargs)
 
+    if kwargs.get("stream"):
+        logger.info("Streaming images")
+        return images
+
+    images = list(images)
+
     logger.info(f"{len(images)} images found")
     logger.debug(images)
 
@@ -74,16 +83,20 @@ def search_images(filters, **kwargs):
     created_after = kwargs.get("created_after")
     exclude_aws_backup = kwargs.get("exclude_aws_backup")
 
-    session_objects = set_session_objects(session, resources=["ec2"], region=region)
-    images = []
+    session_objects = set_session_objects(session, clients=["ec2"], region=region)
 
-    response = session_objects["ec2_resource"].images.filter(
-        Filters=filters, Owners=["self"], ImageIds=image_ids
+    response = paginate(
+        session_objects["ec2_client"],
+        "describe_images",
+        "Images",
+        Filters=filters,
+        Owners=["self"],
+        ImageIds=image_ids,
     )
 
     for image in response:
         creation_date = datetime.fromisoformat(
-            image.creation_date.replace("Z", "+00:00")
+            image["CreationDate"].replace("Z", "+00:00")
         )
         if created_before and creation_date > created_before.replace(
             tzinfo=timezone.utc
@@ -92,9 +105,7 @@ def search_images(filters, **kwargs):
         if created_after and creation_date < created_after.replace(tzinfo=timezone.utc):
             continue
         if exclude_aws_backup and any(
-            tag["Key"].startswith("aws:backup") for tag in (image.tags or [])
+            tag["Key"].startswith("aws:backup") for tag in image.get("Tags", [])
         ):
             continue
-        images.append(image.id)
-
-    return images
+        yield image if kwargs.get("detail") else image["ImageId"]
@@ -4,7 +4,10 @@ from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
 from avtomat_aws.helpers.format_tags import format_tags
+from avtomat_aws.helpers.inventory import search_inventory
+from avtomat_aws.helpers.paginate import paginate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.tag_predicate import WILDCARDS, compile_tags
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +18,9 @@ DEFAULTS = {
     "invert": False,
     "os": None,
     "public": False,
+    "detail": False,
+    "inventory": False,
+    "stream": False,
     "region": None,
     "debug": False,
     "silent": False,
@@ -40,25 +46,37 @@ RULES = [
 
 @validate(DEFAULTS, RULES)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_instances(**kwargs):
     """Discover EC2 instances based on provided criteria"""
 
     session_objects = set_session_objects(
-        kwargs["session"], resources=["ec2"], region=kwargs["region"]
+        kwargs["session"], clients=["ec2"], region=kwargs["region"]
     )
 
     logger.info("Discovering instances")
 
     filters = build_filters(**kwargs)
-    instances = search_instances(filters, session_objects, **kwargs)
 
-    if kwargs.get("invert"):
+    if kwargs.get("inventory"):
+        instances = search_instance_inventory(**kwargs)
+    elif kwargs.get("invert"):
         logger.debug("Inverting the results")
-        all_instances = session_objects["ec2_resource"].instances.all()
-        instances = [
-            instance.id for instance in all_instances if instance.id not in instances
-        ]
+        # Criteria are matched client side, so every instance is described only once
+        matches = match_instances(**kwargs)
+        instances = (
+            instance if kwargs.get("detail") else instance["InstanceId"]
+            for instance in describe_instances(session_objects["ec2_client"])
+            if not matches(instance)
+        )
+    else:
+        instances = search_instances(filters, session_objects, **kwargs)
+
+    if kwargs.get("stream"):
+        logger.info("Streaming instances")
+        return instances
+
+    instances = list(instances)
 
     logger.info(f"{len(instances)} instances found")
     logger.debug(instances)
@@ -103,17 +121,98 @@ def build_filters(**kwargs):
 def search_instances(filters, session_objects, **kwargs):
     """Search for instances in specified region"""
 
-    response = session_objects["ec2_resource"].instances.filter(
-        Filters=filters, InstanceIds=kwargs["instance_ids"]
+    linux = kwargs.get("os") and kwargs["os"].lower() == "linux"
+
+    response = describe_instances(
+        session_objects["ec2_client"],
+        Filters=filters,
+        InstanceIds=kwargs["instance_ids"],
     )
-    instances = [instance.id for instance in response]
 
-    if kwargs.get("os") and kwargs["os"].lower() == "linux":
-        windows_filters = [{"Name": "platform", "Values": ["windows"]}]
-        response = session_objects["ec2_resource"].instances.filter(
-            Filters=windows_filters, InstanceIds=kwargs["instance_ids"]
+    for instance in response:
+        # Windows is the only platform set, there's no filter for its absence
+        if linux and instance.get("Platform") == "windows":
+            continue
+        yield instance if kwargs.get("detail") else instance["InstanceId"]
+
+
+def format_instance_tags(tags):
+    """Format tags as the filters apply them, a tag with an empty value matches any value"""
+
+    return [
+        tag if tag.get("Value") else {"Key": tag["Key"]} for tag in format_tags(tags)
+    ]
+
+
+def match_instances(**kwargs):
+    """Return a predicate over instance describe records matching them as the filters would"""
+
+    states = set(kwargs["states"])
+    instance_ids = set(kwargs["instance_ids"])
+    has_tags = compile_tags(format_instance_tags(kwargs["tags"]))
+    public = kwargs.get("public")
+    os_name = (kwargs.get("os") or "").lower()
+
+    def matches(instance):
+        return (
+            instance["State"]["Name"] in states
+            and (not instance_ids or instance["InstanceId"] in instance_ids)
+            and has_tags(instance.get("Tags"))
+            and (not public or bool(instance.get("PublicIpAddress")))
+            and (
+                not os_name
+                or (instance.get("Platform") == "windows") == (os_name == "windows")
+            )
         )
-        windows_instances = [instance.id for instance in response]
-        instances = [id for id in instances if id not in windows_instances]
 
-    return instances
+    return matches
+
+
+def describe_instances(client, **params):
+    """Yield describe records of instances, without building resource objects"""
+
+    # Page size can't be combined with instance IDs
+    page_size = None if params.get("InstanceIds") else 1000
+
+    for reservation in paginate(
+        client, "describe_instances", "Reservations", page_size=page_size, **params
+    ):
+        yield from reservation["Instances"]
+
+
+def search_instance_inventory(**kwargs):
+    """Search for instances in the local inventory"""
+
+    inventory_kwargs = {"session": kwargs["session"], "region": kwargs["region"]}
+    matches = match_instances(**kwargs)
+
+    if kwargs.get("invert"):
+        logger.debug("Inverting the results")
+        records = (
+            record
+            for record in search_inventory("instance", **inventory_kwargs)
+            if not matches(record)
+        )
+    else:
+        # Indexed lookups narrow the records down, wildcards and the rest are matched after
+        tags = [
+            tag
+            for tag in format_instance_tags(kwargs["tags"])
+            if not any(
+                wildcard in tag["Key"] + (tag.get("Value") or "")
+                for wildcard in WILDCARDS
+            )
+        ]
+        records = filter(
+            matches,
+            search_inventory(
+                "instance",
+                ids=kwargs["instance_ids"],
+                states=kwargs["states"],
+                tags=tags,
+                **inventory_kwargs,
+            ),
+        )
+
+    for record in records:
+        yield record if kwargs.get("detail") else record["InstanceId"]
@@ -1,56 +1,165 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.inventory import search_inventory
+from avtomat_aws.helpers.paginate import paginate, paginate_pages
+from avtomat_aws.helpers.prefetch import prefetch
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
 
-DEFAULTS = {"instance_ids": [], "region": None, "debug": False, "silent": False}
+PAGES_AHEAD = 2  # Instance pages fetched while SSM is still being enumerated
+DEFAULTS = {
+    "instance_ids": [],
+    "stale_days": None,
+    "agent_versions": False,
+    "inventory": False,
+    "stream": False,
+    "region": None,
+    "debug": False,
+    "silent": False,
+}
 
 
 @validate(DEFAULTS)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_no_ssm_instances(**kwargs):
     """Discover EC2 instances without SSM enabled"""
 
     session_objects = set_session_objects(
         kwargs["session"],
         clients=["ec2", "ssm"],
-        resources=["ec2"],
         region=kwargs["region"],
     )
 
     logger.info(f"Discovering instances without SSM enabled")
 
-    ssm_instances = []
-    response = session_objects["ssm_client"].describe_instance_information(
-        InstanceInformationFilterList=[{"key": "PingStatus", "valueSet": ["Online"]}]
-    )
-    while True:
-        for instance in response["InstanceInformationList"]:
-            ssm_instances.append(instance["InstanceId"])
-
-        if response.get("NextToken"):
-            response = session_objects["ssm_client"].describe_instance_information(
-                InstanceInformationFilterList=[
-                    {"key": "PingStatus", "valueSet": ["Online"]}
-                ],
-                NextToken=response["NextToken"],
+    # SSM and EC2 are enumerated concurrently, each on its own thread
+    executor = ThreadPoolExecutor(max_workers=1)
+    ssm_future = executor.submit(describe_ssm_instances, session_objects["ssm_client"])
+    executor.shutdown(wait=False)
+
+    if kwargs.get("inventory"):
+        instance_ids = (
+            instance["InstanceId"]
+            for instance in search_inventory(
+                "instance",
+                ids=kwargs["instance_ids"],
+                session=kwargs["session"],
+                region=kwargs["region"],
             )
-        else:
-            break
+        )
+    else:
+        instance_ids = list_instance_ids(session_objects["ec2_client"], **kwargs)
+
+    # Buckets need every instance, so they aren't streamed
+    if kwargs.get("stale_days") is not None or kwargs.get("agent_versions"):
+        return report_buckets(
+            ssm_future,
+            list(instance_ids),
+            kwargs.get("stale_days"),
+            kwargs.get("agent_versions"),
+        )
+
+    no_ssm_instances = search_no_ssm_instances(ssm_future, instance_ids)
 
-    no_ssm_instances = []
-    for instance in session_objects["ec2_resource"].instances.filter(
-        InstanceIds=kwargs["instance_ids"]
-    ):
-        if instance.id not in ssm_instances:
-            no_ssm_instances.append(instance.id)
+    if kwargs.get("stream"):
+        logger.info("Streaming instances")
+        return no_ssm_instances
+
+    no_ssm_instances = list(no_ssm_instances)
 
     logger.info(f"{len(no_ssm_instances)} instances found")
     logger.debug(no_ssm_instances)
 
     return no_ssm_instances
+
+
+def describe_ssm_instances(client):
+    """Return SSM information of every managed instance keyed by instance ID"""
+
+    # Every ping status is described, so stale instances are reported without another pass
+    return {
+        instance["InstanceId"]: instance
+        for instance in paginate(
+            client,
+            "describe_instance_information",
+            "InstanceInformationList",
+            page_size=50,
+        )
+    }
+
+
+def list_instance_ids(client, **kwargs):
+    """Yield EC2 instance IDs, fetching pages ahead on a background thread"""
+
+    instance_ids = kwargs["instance_ids"]
+
+    # Page size can't be combined with instance IDs
+    pages = paginate_pages(
+        client,
+        "describe_instances",
+        page_size=None if instance_ids else 1000,
+        InstanceIds=instance_ids,
+    )
+
+    for page in prefetch(pages, PAGES_AHEAD, label="Instances"):
+        for reservation in page.get("Reservations") or []:
+            for instance in reservation["Instances"]:
+                yield instance["InstanceId"]
+
+
+def search_no_ssm_instances(ssm_future, instance_ids):
+    """Yield instances that aren't online in SSM as they are enumerated"""
+
+    online = None
+    for instance_id in instance_ids:
+        # The first page of instances is fetched while SSM is enumerated
+        if online is None:
+            online = {
+                managed_id
+                for managed_id, instance in ssm_future.result().items()
+                if instance.get("PingStatus") == "Online"
+            }
+        if instance_id not in online:
+            yield instance_id
+
+
+def report_buckets(ssm_future, instance_ids, stale_days=None, agent_versions=False):
+    """Return instances without SSM along with stale ping and agent version buckets"""
+
+    ssm_instances = ssm_future.result()
+    no_ssm_instances = list(search_no_ssm_instances(ssm_future, instance_ids))
+    # Managed on-premises servers and instances outside the focus aren't reported
+    managed = [
+        instance_id for instance_id in instance_ids if instance_id in ssm_instances
+    ]
+
+    report = {"NoSSM": no_ssm_instances}
+
+    if stale_days is not None:
+        threshold = datetime.now(timezone.utc) - timedelta(days=stale_days)
+        stale = {}
+        for instance_id in managed:
+            instance = ssm_instances[instance_id]
+            last_ping = instance.get("LastPingDateTime")
+            if last_ping and last_ping < threshold:
+                stale.setdefault(instance["PingStatus"], []).append(instance_id)
+        report["StalePing"] = stale
+
+    if agent_versions:
+        versions = {}
+        for instance_id in managed:
+            version = ssm_instances[instance_id].get("AgentVersion") or "unknown"
+            versions.setdefault(version, []).append(instance_id)
+        report["AgentVersions"] = versions
+
+    logger.info(f"{len(no_ssm_instances)} instances found")
+    logger.debug(report)
+
+    return report
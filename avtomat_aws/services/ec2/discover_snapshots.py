@@ -4,6 +4,8 @@ from datetime import datetime, timezone
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.paginate import paginate_pages
+from avtomat_aws.helpers.prefetch import prefetch
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,9 @@ DEFAULTS = {
     "exclude_aws_backup": False,
     "created_before": None,
     "created_after": None,
+    "detail": False,
+    "stream": False,
+    "prefetch": 0,
     "region": None,
     "debug": False,
     "silent": False,
@@ -27,7 +32,7 @@ RULES = [
 
 @validate(DEFAULTS, RULES)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_snapshots(**kwargs):
     """Discover snapshots based on provided criteria"""
 
@@ -43,6 +48,12 @@ def discover_snapshots(**kwargs):
     filters = build_filters(**kwargs)
     snapshots = search_snapshots(filters, **kwargs)
 
+    if kwargs.get("stream"):
+        logger.info("Streaming snapshots")
+        return snapshots
+
+    snapshots = list(snapshots)
+
     logger.info(f"{len(snapshots)} snapshots found")
     logger.debug(snapshots)
 
@@ -78,30 +89,42 @@ def search_snapshots(filters, **kwargs):
     session = kwargs["session"]
     region = kwargs["region"]
     snapshot_ids = kwargs.get("snapshot_ids")
-    created_before = kwargs.get("created_before")
-    created_after = kwargs.get("created_after")
-    exclude_aws_backup = kwargs.get("exclude_aws_backup")
 
-    session_objects = set_session_objects(session, resources=["ec2"], region=region)
-    snapshots = []
+    session_objects = set_session_objects(session, clients=["ec2"], region=region)
 
-    response = session_objects["ec2_resource"].snapshots.filter(
-        Filters=filters, OwnerIds=["self"], SnapshotIds=snapshot_ids
+    # Page size can't be combined with snapshot IDs
+    response = paginate_pages(
+        session_objects["ec2_client"],
+        "describe_snapshots",
+        page_size=None if snapshot_ids else 1000,
+        Filters=filters,
+        OwnerIds=["self"],
+        SnapshotIds=snapshot_ids,
     )
 
-    for snapshot in response:
-        if created_before and snapshot.start_time > created_before.replace(
+    # Filtering runs while the following pages are fetched in the background
+    for page in prefetch(response, kwargs.get("prefetch"), label="Snapshots"):
+        yield from filter_snapshots(page.get("Snapshots") or [], **kwargs)
+
+
+def filter_snapshots(snapshots, **kwargs):
+    """Filter snapshots based on additional criteria"""
+
+    created_before = kwargs.get("created_before")
+    created_after = kwargs.get("created_after")
+    exclude_aws_backup = kwargs.get("exclude_aws_backup")
+
+    for snapshot in snapshots:
+        if created_before and snapshot["StartTime"] > created_before.replace(
             tzinfo=timezone.utc
         ):
             continue
-        if created_after and snapshot.start_time < created_after.replace(
+        if created_after and snapshot["StartTime"] < created_after.replace(
             tzinfo=timezone.utc
         ):
             continue
         if exclude_aws_backup and any(
-            tag["Key"].startswith("aws:backup") for tag in (snapshot.tags or [])
+            tag["Key"].startswith("aws:backup") for tag in snapshot.get("Tags", [])
         ):
             continue
-        snapshots.append(snapshot.id)
-
-    return snapshots
+        yield snapshot if kwargs.get("detail") else snapshot["SnapshotId"]
@@ -3,14 +3,102 @@ import logging
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.fan_out import fan_out
 from avtomat_aws.helpers.format_tags import format_tags
+from avtomat_aws.helpers.inventory import INVENTORY_TYPES, search_inventory
+from avtomat_aws.helpers.paginate import paginate, paginate_pages
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.tag_predicate import WILDCARDS, compile_tags
 
 logger = logging.getLogger(__name__)
 
+ENGINES = ["collections", "index"]
+# describe_tags resource type and the describe call per resource type
+RESOURCE_TYPES = {
+    "image": {
+        "tag_type": "image",
+        "operation": "describe_images",
+        "result_key": "Images",
+        "id_key": "ImageId",
+        "params": {"Owners": ["self"]},
+    },
+    "instance": {
+        "tag_type": "instance",
+        "operation": "describe_instances",
+        "result_key": "Reservations",
+        "id_key": "InstanceId",
+        "params": {},
+    },
+    "internet_gateway": {
+        "tag_type": "internet-gateway",
+        "operation": "describe_internet_gateways",
+        "result_key": "InternetGateways",
+        "id_key": "InternetGatewayId",
+        "params": {},
+    },
+    "key_pair": {
+        "tag_type": "key-pair",
+        "operation": "describe_key_pairs",
+        "result_key": "KeyPairs",
+        "id_key": "KeyPairId",
+        "name_key": "KeyName",  # Results use key pair names
+        "params": {},
+    },
+    "network_acl": {
+        "tag_type": "network-acl",
+        "operation": "describe_network_acls",
+        "result_key": "NetworkAcls",
+        "id_key": "NetworkAclId",
+        "params": {},
+    },
+    "route_table": {
+        "tag_type": "route-table",
+        "operation": "describe_route_tables",
+        "result_key": "RouteTables",
+        "id_key": "RouteTableId",
+        "params": {},
+    },
+    "security_group": {
+        "tag_type": "security-group",
+        "operation": "describe_security_groups",
+        "result_key": "SecurityGroups",
+        "id_key": "GroupId",
+        "params": {},
+    },
+    "snapshot": {
+        "tag_type": "snapshot",
+        "operation": "describe_snapshots",
+        "result_key": "Snapshots",
+        "id_key": "SnapshotId",
+        "params": {"OwnerIds": ["self"]},
+    },
+    "subnet": {
+        "tag_type": "subnet",
+        "operation": "describe_subnets",
+        "result_key": "Subnets",
+        "id_key": "SubnetId",
+        "params": {},
+    },
+    "volume": {
+        "tag_type": "volume",
+        "operation": "describe_volumes",
+        "result_key": "Volumes",
+        "id_key": "VolumeId",
+        "params": {},
+    },
+    "vpc": {
+        "tag_type": "vpc",
+        "operation": "describe_vpcs",
+        "result_key": "Vpcs",
+        "id_key": "VpcId",
+        "params": {},
+    },
+}
 DEFAULTS = {
     "existing": False,
     "missing": False,
+    "inventory": False,
+    "engine": "collections",
     "region": None,
     "debug": False,
     "silent": False,
@@ -34,6 +122,7 @@ RULES = [
                     "vpc",
                 ]
             },
+            {"engine": ENGINES},
         ]
     },
     {"at_most_one": ["existing", "missing"]},
@@ -43,7 +132,7 @@ RULES = [
 
 @validate(DEFAULTS, RULES)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_tags(**kwargs):
     """Discover specific tags that exist on EC2 resources"""
 
@@ -52,7 +141,7 @@ def discover_tags(**kwargs):
     tags = kwargs.pop("tags")
 
     session_objects = set_session_objects(
-        kwargs["session"], resources=["ec2"], region=kwargs["region"]
+        kwargs["session"], clients=["ec2"], region=kwargs["region"]
     )
 
     if kwargs.get("existing"):
@@ -62,39 +151,38 @@ def discover_tags(**kwargs):
 
     formatted_tags = format_tags(tags)
     resources = []
-    if "image" in resource_types:
-        response = session_objects["ec2_resource"].images.filter(Owners=["self"])
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "instance" in resource_types:
-        response = session_objects["ec2_resource"].instances.all()
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "internet_gateway" in resource_types:
-        response = session_objects["ec2_resource"].internet_gateways.all()
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "key_pair" in resource_types:
-        response = session_objects["ec2_resource"].key_pairs.all()
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "network_acl" in resource_types:
-        response = session_objects["ec2_resource"].network_acls.all()
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "route_table" in resource_types:
-        response = session_objects["ec2_resource"].route_tables.all()
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "security_group" in resource_types:
-        response = session_objects["ec2_resource"].security_groups.all()
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "snapshot" in resource_types:
-        response = session_objects["ec2_resource"].snapshots.filter(OwnerIds=["self"])
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "subnet" in resource_types:
-        response = session_objects["ec2_resource"].subnets.all()
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "volume" in resource_types:
-        response = session_objects["ec2_resource"].volumes.all()
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
-    if "vpc" in resource_types:
-        response = session_objects["ec2_resource"].vpcs.all()
-        resources.extend(search_collections(response, formatted_tags, **kwargs))
+    if kwargs.get("inventory"):
+        for resource_type in INVENTORY_TYPES:
+            if resource_type in resource_types:
+                resources.extend(
+                    search_inventory_tags(resource_type, formatted_tags, **kwargs)
+                )
+        # Remaining types are described as usual
+        resource_types = [
+            resource_type
+            for resource_type in resource_types
+            if resource_type not in INVENTORY_TYPES
+        ]
+    if kwargs.get("engine") == "index":
+        resources.extend(
+            search_tag_index(
+                resource_types, formatted_tags, session_objects["ec2_client"], **kwargs
+            )
+        )
+        resource_types = []  # Every type is answered by the index
+
+    params = {}
+    filters = build_filters(formatted_tags, **kwargs)
+    if filters:
+        params["Filters"] = filters
+    for resource_type in RESOURCE_TYPES:
+        if resource_type in resource_types:
+            response = describe_resources(
+                resource_type, session_objects["ec2_client"], **params
+            )
+            resources.extend(
+                search_collections(response, formatted_tags, resource_type, **kwargs)
+            )
 
     logger.info(f"{len(resources)} resources found")
     logger.debug(resources)
@@ -102,46 +190,173 @@ def discover_tags(**kwargs):
     return resources
 
 
-def search_collections(response, tags, **kwargs):
-    """Iterate through resources in the response and return ones that have or don't have supplied tags"""
+def build_filters(tags, **kwargs):
+    """Construct tag filters, only resources with every tag can match in existing mode"""
+
+    filters = []
+    if not kwargs.get("existing"):
+        return filters
+
+    tag_keys = []
+    for tag in tags:
+        # Keys with wildcards can't be filtered on, they are matched client side
+        if any(wildcard in tag["Key"] for wildcard in WILDCARDS):
+            continue
+        if tag.get("Value"):
+            filters.append({"Name": f"tag:{tag['Key']}", "Values": [tag["Value"]]})
+        else:
+            tag_keys.append(tag["Key"])
+    # A tag-key filter matches any of its keys, so only one is pushed down and the rest, like
+    # empty values, are matched client side
+    if tag_keys:
+        filters.append({"Name": "tag-key", "Values": tag_keys[:1]})
+    logger.debug(f"Filters: {filters}")
+
+    return filters
+
+
+def describe_resources(resource_type, client, page_size=1000, **params):
+    """Yield pages of describe records of a resource type"""
 
-    missing = kwargs.get("missing")
-    existing = kwargs.get("existing")
+    resource = RESOURCE_TYPES[resource_type]
 
+    # Key pairs aren't paginated
+    if resource_type == "key_pair":
+        yield client.describe_key_pairs(**params)["KeyPairs"]
+        return
+
+    # Route tables are described at most 100 at a time
+    if resource_type == "route_table":
+        page_size = min(page_size, 100)
+
+    for page in paginate_pages(
+        client,
+        resource["operation"],
+        page_size=page_size,
+        **resource["params"],
+        **params,
+    ):
+        items = page.get(resource["result_key"]) or []
+        # Instances are described inside their reservations
+        if resource_type == "instance":
+            items = [
+                instance
+                for reservation in items
+                for instance in reservation["Instances"]
+            ]
+        yield items
+
+
+def search_collections(response, tags, resource_type, **kwargs):
+    """Iterate through pages of describe records and return resources that have or don't have supplied tags"""
+
+    # Filters narrow down what is transferred, tags are still matched exactly, e.g. filter wildcards
+    has_tags = compile_tags(tags, missing=kwargs.get("missing"))
+    resource = RESOURCE_TYPES[resource_type]
+    name_key = resource.get("name_key", resource["id_key"])
+
+    transferred = 0
     resources = []
-    for resource in response:
-        resource_tags = {
-            tag["Key"]: tag.get("Value", None)
-            for tag in getattr(resource, "tags") or []
-        }
-        match = False
-
-        if missing:
-            match = any(
-                (
-                    tag["Key"] not in resource_tags
-                    or (
-                        tag.get("Value") is not None
-                        and resource_tags[tag["Key"]] != tag["Value"]
-                    )
-                )
-                for tag in tags
-            )
+    for page in response:
+        transferred += len(page)
+        resources.extend(item[name_key] for item in page if has_tags(item.get("Tags")))
 
-        elif existing:
-            match = all(
-                tag["Key"] in resource_tags
-                and (
-                    tag.get("Value") is None
-                    or resource_tags[tag["Key"]] == tag["Value"]
-                )
-                for tag in tags
-            )
+    logger.info(
+        f"{resource_type} - {transferred} resources transferred, {len(resources)} matched"
+    )
+
+    return resources
+
+
+def search_inventory_tags(resource_type, tags, **kwargs):
+    """Return resources of a type in the local inventory that have or don't have supplied tags"""
+
+    id_key = INVENTORY_TYPES[resource_type]["id_key"]
+    has_tags = compile_tags(tags, missing=kwargs.get("missing"))
+
+    resources = []
+    for record in search_inventory(resource_type, **kwargs):
+        if has_tags(record.get("Tags")):
+            resources.append(record[id_key])
+
+    return resources
+
+
+def build_tag_index(resource_types, tags, client):
+    """Return tags of resources with any of the supplied tag keys, keyed by describe_tags resource type and ID"""
 
-        if match:
-            try:
-                resources.append(resource.id)
-            except AttributeError:
-                resources.append(resource.name)
+    filters = [
+        {
+            "Name": "resource-type",
+            "Values": [
+                RESOURCE_TYPES[resource_type]["tag_type"]
+                for resource_type in resource_types
+            ],
+        },
+    ]
+    keys = list(dict.fromkeys(tag["Key"] for tag in tags))
+    if not any(wildcard in key for key in keys for wildcard in WILDCARDS):
+        filters.append({"Name": "key", "Values": keys})
+
+    index = {}
+    for tag in paginate(
+        client, "describe_tags", "Tags", page_size=1000, Filters=filters
+    ):
+        resource_tags = index.setdefault(tag["ResourceType"], {})
+        resource_tags.setdefault(tag["ResourceId"], []).append(tag)
+
+    return index
+
+
+def list_resource_ids(resource_type, client):
+    """Return IDs of every resource of a type mapped to the name results use for it"""
+
+    resource = RESOURCE_TYPES[resource_type]
+    id_key = resource["id_key"]
+    # Tags reference key pair IDs while results use their names
+    name_key = resource.get("name_key", id_key)
+
+    return {
+        item[id_key]: item[name_key]
+        for page in describe_resources(resource_type, client)
+        for item in page
+    }
+
+
+def search_tag_index(resource_types, tags, client, **kwargs):
+    """Return resources that have or don't have supplied tags from a single describe_tags pass"""
+
+    has_tags = compile_tags(tags, missing=kwargs.get("missing"))
+    index = build_tag_index(resource_types, tags, client)
+    logger.debug(
+        f"{sum(len(ids) for ids in index.values())} resources indexed by tag keys"
+    )
+
+    # Only indexed resources can have every tag, missing tags need every ID of the type
+    listed_types = [
+        resource_type
+        for resource_type in resource_types
+        if kwargs.get("missing") or resource_type == "key_pair"
+    ]
+    listed, failed = fan_out(
+        lambda resource_type: list_resource_ids(resource_type, client),
+        listed_types,
+        workers=kwargs.get("workers") or len(listed_types),
+        label="Resource type",
+    )
+    # A failed listing would report resources as compliant
+    if failed:
+        raise next(iter(failed.values()))
+
+    resources = []
+    for resource_type in resource_types:
+        tagged = index.get(RESOURCE_TYPES[resource_type]["tag_type"], {})
+        if resource_type in listed:
+            names = listed[resource_type]
+        else:
+            names = {resource_id: resource_id for resource_id in tagged}
+        for resource_id, name in names.items():
+            if has_tags(tagged.get(resource_id)):
+                resources.append(name)
 
     return resources
@@ -3,44 +3,88 @@ import logging
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.fan_out import fan_out
+from avtomat_aws.helpers.paginate import paginate, paginate_pages
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.sg_graph import (
+    build_sg_graph,
+    describe_sgs,
+    list_referenced_sgs,
+    order_sg_deletion,
+)
 
 logger = logging.getLogger(__name__)
 
-DEFAULTS = {"region": None, "debug": False, "silent": False}
-
-
-@validate(DEFAULTS)
+MODES = ["full", "eni", "verify"]
+# Every service that can attach security groups
+FULL_COLLECTORS = [
+    "eni",
+    "ec2",
+    "rds",
+    "elb",
+    "elbv2",
+    "lambda",
+    "redshift",
+    "elasticache",
+    "emr",
+    "ecs",
+    "neptune",
+    "opensearch",
+    "msk",
+    "launch_template",
+]
+# Most services attach security groups through ENIs, the rest are covered separately
+ENI_COLLECTORS = ["eni", "launch_template", "elb"]
+DEFAULTS = {
+    "mode": "full",
+    "collectors": None,
+    "skip_collectors": [],
+    "region": None,
+    "debug": False,
+    "silent": False,
+}
+RULES = [
+    {
+        "choice": [
+            {"mode": MODES},
+            {"collectors": FULL_COLLECTORS},
+            {"skip_collectors": FULL_COLLECTORS},
+        ]
+    }
+]
+
+
+@validate(DEFAULTS, RULES)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_unused_security_groups(**kwargs):
     """Discover unused security groups"""
 
     session = kwargs["session"]
     region = kwargs["region"]
+    mode = kwargs["mode"]
 
-    logger.info("Discovering unused security groups")
+    logger.info(f"Discovering unused security groups ({mode} mode)")
 
-    all_sgs = list_all_sgs(session, region)
+    sgs = describe_sgs(session, region)
+    graph = build_sg_graph(sgs)
 
-    attached_sgs = set()
-    attached_sgs.update(list_eni_attached_sgs(session, region))
-    attached_sgs.update(list_ec2_attached_sgs(session, region))
-    attached_sgs.update(list_rds_attached_sgs(session, region))
-    attached_sgs.update(list_elb_attached_sgs(session, region))
-    attached_sgs.update(list_elbv2_attached_sgs(session, region))
-    attached_sgs.update(list_lambda_attached_sgs(session, region))
-    attached_sgs.update(list_redshift_attached_sgs(session, region))
-    attached_sgs.update(list_elasticache_attached_sgs(session, region))
-    attached_sgs.update(list_emr_attached_sgs(session, region))
-    attached_sgs.update(list_ecs_attached_sgs(session, region))
-    attached_sgs.update(list_neptune_attached_sgs(session, region))
-    attached_sgs.update(
-        list_opensearch_attached_sgs(session, region)
-    )  # No pagination support
-    attached_sgs.update(list_msk_attached_sgs(session, region))
-
-    unattached_sgs = list(all_sgs - attached_sgs)
+    if mode == "verify":
+        # Collectors that didn't run would count as empty in one of the two results
+        if kwargs["collectors"] or kwargs["skip_collectors"]:
+            raise ValueError(
+                "Parameters 'collectors' and 'skip_collectors' are not supported in verify mode"
+            )
+        # The full collectors include the ENI ones
+        results = run_collectors(FULL_COLLECTORS, **kwargs)
+        unattached_sgs = find_unattached_sgs(graph, results, FULL_COLLECTORS)
+        fast_unattached_sgs = find_unattached_sgs(graph, results, ENI_COLLECTORS)
+        verify_unattached_sgs(unattached_sgs, fast_unattached_sgs)
+    else:
+        default_collectors = ENI_COLLECTORS if mode == "eni" else FULL_COLLECTORS
+        selected = kwargs["collectors"] or default_collectors
+        results = run_collectors(selected, **kwargs)
+        unattached_sgs = find_unattached_sgs(graph, results, selected)
 
     logger.info(f"{len(unattached_sgs)} unattached security groups found")
     logger.debug(unattached_sgs)
@@ -48,24 +92,106 @@ def discover_unused_security_groups(**kwargs):
     return unattached_sgs
 
 
-def list_all_sgs(session, region):
-    """Return all security groups"""
+def run_collectors(selected, **kwargs):
+    """Run the selected collectors concurrently and return attached security groups per collector"""
 
-    session_objects = set_session_objects(session, clients=["ec2"], region=region)
-    sgs = set()
+    session = kwargs["session"]
+    region = kwargs["region"]
 
-    response = session_objects["ec2_client"].describe_security_groups(MaxResults=500)
+    functions = {
+        "eni": list_eni_attached_sgs,
+        "ec2": list_ec2_attached_sgs,
+        "rds": list_rds_attached_sgs,
+        "elb": list_elb_attached_sgs,
+        "elbv2": list_elbv2_attached_sgs,
+        "lambda": list_lambda_attached_sgs,
+        "redshift": list_redshift_attached_sgs,
+        "elasticache": list_elasticache_attached_sgs,
+        "emr": list_emr_attached_sgs,
+        "ecs": list_ecs_attached_sgs,
+        "neptune": list_neptune_attached_sgs,
+        "opensearch": list_opensearch_attached_sgs,  # No pagination support
+        "msk": list_msk_attached_sgs,
+        "launch_template": list_launch_template_sgs,
+    }
+    collectors = [
+        collector
+        for collector in selected
+        if collector not in kwargs["skip_collectors"]
+    ]
+    logger.debug(f"Collectors: {collectors}")
+
+    # Clients are pooled per session and region, so collectors share them across threads
+    results, failed = fan_out(
+        lambda collector: functions[collector](session, region),
+        collectors,
+        workers=kwargs.get("workers") or len(collectors),
+        label="Collector",
+    )
 
-    if response:
-        for sg in response["SecurityGroups"]:
-            sgs.add(sg["GroupId"])
+    # A failed collector could hide attachments, so don't report anything as unused
+    if failed:
+        raise next(iter(failed.values()))
+
+    return results
+
+
+def find_unattached_sgs(graph, results, collectors):
+    """Return security groups that none of the collectors found attached or referenced, in deletion order"""
+
+    attached_sgs = set()
+    for collector in collectors:
+        attached_sgs.update(results.get(collector, set()))
+
+    # Groups referenced by the rules of a group in use can't be deleted either
+    attached_sgs.update(list_referenced_sgs(graph, attached_sgs))
+
+    unattached_sgs = [sg_id for sg_id in graph if sg_id not in attached_sgs]
+    batches = order_sg_deletion(graph, unattached_sgs)
+
+    return [sg_id for batch in batches for sg_id in batch]
+
+
+def verify_unattached_sgs(unattached_sgs, fast_unattached_sgs):
+    """Log differences between the full scan and the ENI fast path"""
+
+    only_full = set(unattached_sgs) - set(fast_unattached_sgs)
+    only_fast = set(fast_unattached_sgs) - set(unattached_sgs)
 
-    while "NextToken" in response:
-        response = session_objects["ec2_client"].describe_security_groups(
-            MaxResults=500, NextToken=response["NextToken"]
+    if not only_full and not only_fast:
+        logger.info("ENI fast path matches the full scan")
+        return
+
+    if only_full:
+        logger.warning(
+            f"{len(only_full)} security groups unattached only in the full scan"
         )
-        for sg in response["SecurityGroups"]:
-            sgs.add(sg["GroupId"])
+        logger.debug(sorted(only_full))
+    if only_fast:
+        logger.warning(
+            f"{len(only_fast)} security groups unattached only in the ENI fast path"
+        )
+        logger.debug(sorted(only_fast))
+
+
+def list_launch_template_sgs(session, region):
+    """Return security groups referenced by default and latest launch template versions"""
+
+    session_objects = set_session_objects(session, clients=["ec2"], region=region)
+    sgs = set()
+
+    logger.info("Service: Launch Templates")
+    for version in paginate(
+        session_objects["ec2_client"],
+        "describe_launch_template_versions",
+        "LaunchTemplateVersions",
+        page_size=200,
+        Versions=["$Latest", "$Default"],
+    ):
+        data = version.get("LaunchTemplateData", {})
+        sgs.update(data.get("SecurityGroupIds", []))
+        for interface in data.get("NetworkInterfaces", []):
+            sgs.update(interface.get("Groups", []))
 
     return sgs
 
@@ -77,20 +203,14 @@ def list_eni_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: ENI")
-    response = session_objects["ec2_client"].describe_network_interfaces(MaxResults=250)
-
-    if response:
-        for eni in response["NetworkInterfaces"]:
-            for sg in eni.get("Groups", []):
-                sgs.add(sg["GroupId"])
-
-    while "NextToken" in response:
-        response = session_objects["ec2_client"].describe_network_interfaces(
-            MaxResults=250, NextToken=response["NextToken"]
-        )
-        for eni in response["NetworkInterfaces"]:
-            for sg in eni.get("Groups", []):
-                sgs.add(sg["GroupId"])
+    for eni in paginate(
+        session_objects["ec2_client"],
+        "describe_network_interfaces",
+        "NetworkInterfaces",
+        page_size=1000,
+    ):
+        for sg in eni.get("Groups", []):
+            sgs.add(sg["GroupId"])
 
     return sgs
 
@@ -102,22 +222,15 @@ def list_ec2_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: EC2")
-    response = session_objects["ec2_client"].describe_instances(MaxResults=250)
-
-    if response:
-        for reservation in response["Reservations"]:
-            for instance in reservation["Instances"]:
-                for sg in instance["SecurityGroups"]:
-                    sgs.add(sg["GroupId"])
-
-    while "NextToken" in response:
-        response = session_objects["ec2_client"].describe_instances(
-            MaxResults=250, NextToken=response["NextToken"]
-        )
-        for reservation in response["Reservations"]:
-            for instance in reservation["Instances"]:
-                for sg in instance["SecurityGroups"]:
-                    sgs.add(sg["GroupId"])
+    for reservation in paginate(
+        session_objects["ec2_client"],
+        "describe_instances",
+        "Reservations",
+        page_size=1000,
+    ):
+        for instance in reservation["Instances"]:
+            for sg in instance["SecurityGroups"]:
+                sgs.add(sg["GroupId"])
 
     return sgs
 
@@ -129,20 +242,14 @@ def list_rds_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: RDS")
-    response = session_objects["rds_client"].describe_db_instances(MaxRecords=100)
-
-    if response:
-        for instance in response["DBInstances"]:
-            for sg in instance["VpcSecurityGroups"]:
-                sgs.add(sg["VpcSecurityGroupId"])
-
-    while "Marker" in response:
-        response = session_objects["rds_client"].describe_db_instances(
-            MaxRecords=100, Marker=response["Marker"]
-        )
-        for instance in response["DBInstances"]:
-            for sg in instance["VpcSecurityGroups"]:
-                sgs.add(sg["VpcSecurityGroupId"])
+    for instance in paginate(
+        session_objects["rds_client"],
+        "describe_db_instances",
+        "DBInstances",
+        page_size=100,
+    ):
+        for sg in instance["VpcSecurityGroups"]:
+            sgs.add(sg["VpcSecurityGroupId"])
 
     return sgs
 
@@ -154,20 +261,13 @@ def list_elb_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: ELB")
-    response = session_objects["elb_client"].describe_load_balancers(PageSize=400)
-
-    if response:
-        for lb in response["LoadBalancerDescriptions"]:
-            for sg in lb.get("SecurityGroups", []):
-                sgs.add(sg)
-
-    while "NextMarker" in response:
-        response = session_objects["elb_client"].describe_load_balancers(
-            PageSize=400, Marker=response["NextMarker"]
-        )
-        for lb in response["LoadBalancerDescriptions"]:
-            for sg in lb.get("SecurityGroups", []):
-                sgs.add(sg)
+    for lb in paginate(
+        session_objects["elb_client"],
+        "describe_load_balancers",
+        "LoadBalancerDescriptions",
+        page_size=400,
+    ):
+        sgs.update(lb.get("SecurityGroups", []))
 
     return sgs
 
@@ -179,20 +279,13 @@ def list_elbv2_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: ELBv2")
-    response = session_objects["elbv2_client"].describe_load_balancers(PageSize=400)
-
-    if response:
-        for lb in response["LoadBalancers"]:
-            for sg in lb.get("SecurityGroups", []):
-                sgs.add(sg)
-
-    while "NextMarker" in response:
-        response = session_objects["elbv2_client"].describe_load_balancers(
-            PageSize=400, Marker=response["NextMarker"]
-        )
-        for lb in response["LoadBalancers"]:
-            for sg in lb.get("SecurityGroups", []):
-                sgs.add(sg)
+    for lb in paginate(
+        session_objects["elbv2_client"],
+        "describe_load_balancers",
+        "LoadBalancers",
+        page_size=400,
+    ):
+        sgs.update(lb.get("SecurityGroups", []))
 
     return sgs
 
@@ -204,20 +297,10 @@ def list_lambda_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: Lambda")
-    response = session_objects["lambda_client"].list_functions(MaxItems=50)
-
-    if response:
-        for function in response["Functions"]:
-            for sg in function.get("VpcConfig", {}).get("SecurityGroupIds", []):
-                sgs.add(sg)
-
-    while "NextMarker" in response:
-        response = session_objects["lambda_client"].list_functions(
-            MaxItems=50, Marker=response["NextMarker"]
-        )
-        for function in response["Functions"]:
-            for sg in function.get("VpcConfig", {}).get("SecurityGroupIds", []):
-                sgs.add(sg)
+    for function in paginate(
+        session_objects["lambda_client"], "list_functions", "Functions", page_size=50
+    ):
+        sgs.update(function.get("VpcConfig", {}).get("SecurityGroupIds", []))
 
     return sgs
 
@@ -229,24 +312,14 @@ def list_redshift_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: Redshift")
-    response = session_objects["redshift_client"].describe_clusters(MaxRecords=100)
-
-    if response:
-        for cluster in response["Clusters"]:
-            sg_response = cluster.get("VpcSecurityGroups")
-            if sg_response:
-                for sg in sg_response:
-                    sgs.add(sg["VpcSecurityGroupId"])
-
-    while "Marker" in response:
-        response = session_objects["redshift_client"].describe_clusters(
-            MaxRecords=100, Marker=response["Marker"]
-        )
-        for cluster in response["Clusters"]:
-            sg_response = cluster.get("VpcSecurityGroups")
-            if sg_response:
-                for sg in sg_response:
-                    sgs.add(sg["VpcSecurityGroupId"])
+    for cluster in paginate(
+        session_objects["redshift_client"],
+        "describe_clusters",
+        "Clusters",
+        page_size=100,
+    ):
+        for sg in cluster.get("VpcSecurityGroups") or []:
+            sgs.add(sg["VpcSecurityGroupId"])
 
     return sgs
 
@@ -260,24 +333,14 @@ def list_elasticache_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: ElastiCache")
-    response = session_objects["elasticache_client"].describe_cache_clusters(
-        MaxRecords=100
-    )
-
-    if response:
-        for cluster in response["CacheClusters"]:
-            sg_ids = cluster.get("SecurityGroups")
-            if sg_ids:
-                sgs.update(sg_ids)
-
-    while "Marker" in response:
-        response = session_objects["elasticache_client"].describe_cache_clusters(
-            MaxRecords=100, Marker=response["Marker"]
-        )
-        for cluster in response["CacheClusters"]:
-            sg_ids = cluster.get("SecurityGroups")
-            if sg_ids:
-                sgs.update(sg_ids)
+    for cluster in paginate(
+        session_objects["elasticache_client"],
+        "describe_cache_clusters",
+        "CacheClusters",
+        page_size=100,
+    ):
+        for sg in cluster.get("SecurityGroups") or []:
+            sgs.add(sg["SecurityGroupId"])
 
     return sgs
 
@@ -289,79 +352,26 @@ def list_emr_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: EMR")
-    response = session_objects["emr_client"].list_clusters(
-        ClusterStates=["STARTING", "BOOTSTRAPPING", "RUNNING", "WAITING"]
-    )
-
-    if response:
-        for cluster in response["Clusters"]:
-            cluster_id = cluster["Id"]
-            cluster_response = session_objects["emr_client"].describe_cluster(
-                ClusterId=cluster_id
-            )
-
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "EmrManagedMasterSecurityGroup"
-            )
-            if sg_ids:
-                sgs.add(sg_ids)
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "EmrManagedSlaveSecurityGroup"
-            )
-            if sg_ids:
-                sgs.add(sg_ids)
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "ServiceAccessSecurityGroup"
-            )
-            if sg_ids:
-                sgs.add(sg_ids)
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "AdditionalMasterSecurityGroups"
-            )
-            if sg_ids:
-                sgs.update(sg_ids)
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "AdditionalSlaveSecurityGroups"
-            )
-            if sg_ids:
-                sgs.update(sg_ids)
-
-    while "Marker" in response:
-        response = session_objects["emr_client"].list_clusters(
-            ClusterStates=["STARTING", "BOOTSTRAPPING", "RUNNING", "WAITING"],
-            Marker=response["Marker"],
+    for cluster in paginate(
+        session_objects["emr_client"],
+        "list_clusters",
+        "Clusters",
+        ClusterStates=["STARTING", "BOOTSTRAPPING", "RUNNING", "WAITING"],
+    ):
+        cluster_response = session_objects["emr_client"].describe_cluster(
+            ClusterId=cluster["Id"]
         )
-        for cluster in response["Clusters"]:
-            cluster_id = cluster["Id"]
-            cluster_response = session_objects["emr_client"].describe_cluster(
-                ClusterId=cluster_id
-            )
-
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "EmrManagedMasterSecurityGroup"
-            )
-            if sg_ids:
-                sgs.add(sg_ids)
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "EmrManagedSlaveSecurityGroup"
-            )
-            if sg_ids:
-                sgs.add(sg_ids)
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "ServiceAccessSecurityGroup"
-            )
-            if sg_ids:
-                sgs.add(sg_ids)
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "AdditionalMasterSecurityGroups"
-            )
-            if sg_ids:
-                sgs.update(sg_ids)
-            sg_ids = cluster_response["Cluster"]["Ec2InstanceAttributes"].get(
-                "AdditionalSlaveSecurityGroups"
-            )
-            if sg_ids:
-                sgs.update(sg_ids)
+        attributes = cluster_response["Cluster"]["Ec2InstanceAttributes"]
+
+        for key in [
+            "EmrManagedMasterSecurityGroup",
+            "EmrManagedSlaveSecurityGroup",
+            "ServiceAccessSecurityGroup",
+        ]:
+            if attributes.get(key):
+                sgs.add(attributes[key])
+        for key in ["AdditionalMasterSecurityGroups", "AdditionalSlaveSecurityGroups"]:
+            sgs.update(attributes.get(key) or [])
 
     return sgs
 
@@ -373,49 +383,27 @@ def list_ecs_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: ECS")
-
-    # Paginate through ECS clusters
-    def list_clusters():
-        next_token = None
-        while True:
-            request_args = {"maxResults": 100}
-            if next_token:
-                request_args["nextToken"] = next_token
-            response = session_objects["ecs_client"].list_clusters(**request_args)
-            for cluster_arn in response["clusterArns"]:
-                yield cluster_arn
-            next_token = response.get("nextToken")
-            if not next_token:
-                break
-
-    # Paginate through ECS tasks to collect SGs
-    def list_tasks_and_collect_sgs(cluster_arn):
-        next_token = None
-        while True:
-            request_args = {"cluster": cluster_arn, "maxResults": 100}
-            if next_token:
-                request_args["nextToken"] = next_token
-
-            tasks_response = session_objects["ecs_client"].list_tasks(**request_args)
-
-            task_arns = tasks_response.get("taskArns", [])
-            if task_arns:
-                described_tasks_response = session_objects["ecs_client"].describe_tasks(
-                    cluster=cluster_arn, tasks=task_arns
-                )
-                described_tasks = described_tasks_response.get("tasks", [])
-                for task in described_tasks:
-                    for attachment in task.get("attachments", []):
-                        for detail in attachment.get("details", []):
-                            if detail.get("name") == "securityGroup":
-                                sgs.add(detail["value"])
-
-            next_token = tasks_response.get("nextToken")
-            if not next_token:
-                break
-
-    for arn in list_clusters():
-        list_tasks_and_collect_sgs(arn)
+    for cluster_arn in paginate(
+        session_objects["ecs_client"], "list_clusters", "clusterArns", page_size=100
+    ):
+        # Pages of up to 100 tasks, the most describe_tasks accepts
+        for page in paginate_pages(
+            session_objects["ecs_client"],
+            "list_tasks",
+            page_size=100,
+            cluster=cluster_arn,
+        ):
+            task_arns = page.get("taskArns", [])
+            if not task_arns:
+                continue
+            described_tasks_response = session_objects["ecs_client"].describe_tasks(
+                cluster=cluster_arn, tasks=task_arns
+            )
+            for task in described_tasks_response.get("tasks", []):
+                for attachment in task.get("attachments", []):
+                    for detail in attachment.get("details", []):
+                        if detail.get("name") == "securityGroup":
+                            sgs.add(detail["value"])
 
     return sgs
 
@@ -427,20 +415,14 @@ def list_neptune_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: Neptune")
-    response = session_objects["neptune_client"].describe_db_instances(MaxRecords=100)
-
-    if response:
-        for instance in response["DBInstances"]:
-            for sg in instance["VpcSecurityGroups"]:
-                sgs.add(sg["VpcSecurityGroupId"])
-
-    while "Marker" in response:
-        response = session_objects["neptune_client"].describe_db_instances(
-            MaxRecords=100, Marker=response["Marker"]
-        )
-        for instance in response["DBClusters"]:
-            for sg in instance["VpcSecurityGroups"]:
-                sgs.add(sg["VpcSecurityGroupId"])
+    for instance in paginate(
+        session_objects["neptune_client"],
+        "describe_db_instances",
+        "DBInstances",
+        page_size=100,
+    ):
+        for sg in instance["VpcSecurityGroups"]:
+            sgs.add(sg["VpcSecurityGroupId"])
 
     return sgs
 
@@ -456,14 +438,13 @@ def list_opensearch_attached_sgs(session, region):
     logger.info("Service: OpenSearch")
     response = session_objects["opensearch_client"].list_domain_names()
 
-    if response:
-        for domain in response["DomainNames"]:
-            domain_name = domain["DomainName"]
-            domain_response = session_objects["opensearch_client"].describe_domain(
-                DomainName=domain_name
-            )
-            sg_ids = domain_response["DomainStatus"]["VPCOptions"]["SecurityGroupIds"]
-            sgs.update(sg_ids)
+    for domain in response["DomainNames"]:
+        domain_response = session_objects["opensearch_client"].describe_domain(
+            DomainName=domain["DomainName"]
+        )
+        # Domains outside a VPC have no VPC options
+        vpc_options = domain_response["DomainStatus"].get("VPCOptions", {})
+        sgs.update(vpc_options.get("SecurityGroupIds", []))
 
     return sgs
 
@@ -475,17 +456,12 @@ def list_msk_attached_sgs(session, region):
     sgs = set()
 
     logger.info("Service: MSK")
-    response = session_objects["kafka_client"].list_clusters(MaxResults=100)
-
-    if response:
-        for cluster in response["ClusterInfoList"]:
-            sgs.update(cluster["BrokerNodeGroupInfo"]["SecurityGroups"])
-
-    while "NextToken" in response:
-        response = session_objects["kafka_client"].list_clusters(
-            MaxResults=100, NextToken=response["NextToken"]
-        )
-        for cluster in response["ClusterInfoList"]:
-            sgs.update(cluster["BrokerNodeGroupInfo"]["SecurityGroups"])
+    for cluster in paginate(
+        session_objects["kafka_client"],
+        "list_clusters",
+        "ClusterInfoList",
+        page_size=100,
+    ):
+        sgs.update(cluster["BrokerNodeGroupInfo"]["SecurityGroups"])
 
     return sgs
@@ -3,6 +3,9 @@ import logging
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.inventory import search_inventory
+from avtomat_aws.helpers.paginate import paginate, paginate_pages
+from avtomat_aws.helpers.prefetch import prefetch
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
@@ -14,6 +17,10 @@ DEFAULTS = {
     "detached": False,
     "types": None,
     "root": False,
+    "detail": False,
+    "inventory": False,
+    "stream": False,
+    "prefetch": 0,
     "region": None,
     "debug": False,
     "silent": False,
@@ -30,14 +37,23 @@ RULES = [
 
 @validate(DEFAULTS, RULES)
 @set_logger()
-@authenticate()
+@authenticate(multi_region=True)
 def discover_volumes(**kwargs):
     """Discover EBS volumes based on provided criteria"""
 
     logger.info("Discovering volumes")
 
-    filters = build_filters(**kwargs)
-    volumes = search_volumes(filters, **kwargs)
+    if kwargs.get("inventory"):
+        volumes = search_volume_inventory(**kwargs)
+    else:
+        filters = build_filters(**kwargs)
+        volumes = search_volumes(filters, **kwargs)
+
+    if kwargs.get("stream"):
+        logger.info("Streaming volumes")
+        return volumes
+
+    volumes = list(volumes)
 
     logger.info(f"{len(volumes)} volumes found")
     logger.debug(volumes)
@@ -87,17 +103,20 @@ def search_volumes(filters, **kwargs):
     region = kwargs["region"]
     volume_ids = kwargs.get("volume_ids")
 
-    session_objects = set_session_objects(session, resources=["ec2"], region=region)
-    volumes = []
+    session_objects = set_session_objects(session, clients=["ec2"], region=region)
 
-    response = session_objects["ec2_resource"].volumes.filter(
-        Filters=filters, VolumeIds=volume_ids
+    # Page size can't be combined with volume IDs
+    response = paginate_pages(
+        session_objects["ec2_client"],
+        "describe_volumes",
+        page_size=None if volume_ids else 1000,
+        Filters=filters,
+        VolumeIds=volume_ids,
     )
 
-    for volume in response:
-        volumes.append(volume.id)
-
-    return volumes
+    for page in prefetch(response, kwargs.get("prefetch"), label="Volumes"):
+        for volume in page.get("Volumes") or []:
+            yield volume if kwargs.get("detail") else volume["VolumeId"]
 
 
 def get_root_devices(**kwargs):
@@ -107,12 +126,54 @@ def get_root_devices(**kwargs):
     region = kwargs["region"]
     instance_ids = kwargs.get("instance_ids")
 
-    session_objects = set_session_objects(session, resources=["ec2"], region=region)
+    session_objects = set_session_objects(session, clients=["ec2"], region=region)
 
     root_devices = []
-    for instance in session_objects["ec2_resource"].instances.filter(
-        InstanceIds=instance_ids
+    for reservation in paginate(
+        session_objects["ec2_client"],
+        "describe_instances",
+        "Reservations",
+        InstanceIds=instance_ids,
     ):
-        root_devices.append(instance.root_device_name)
+        for instance in reservation["Instances"]:
+            root_devices.append(instance.get("RootDeviceName"))
 
     return list(set(root_devices))
+
+
+def search_volume_inventory(**kwargs):
+    """Search for volumes in the local inventory"""
+
+    inventory_kwargs = {"session": kwargs["session"], "region": kwargs["region"]}
+    instance_ids = kwargs.get("instance_ids")
+    types = kwargs.get("types")
+
+    root_devices = None
+    if kwargs.get("root"):
+        logger.debug("Filtering for root volumes")
+        root_devices = {
+            instance.get("RootDeviceName")
+            for instance in search_inventory(
+                "instance", ids=instance_ids, **inventory_kwargs
+            )
+        }
+
+    for volume in search_inventory(
+        "volume", ids=kwargs.get("volume_ids"), **inventory_kwargs
+    ):
+        attachments = volume.get("Attachments", [])
+        if instance_ids and not any(
+            attachment["InstanceId"] in instance_ids for attachment in attachments
+        ):
+            continue
+        if kwargs.get("unencrypted") and volume.get("Encrypted"):
+            continue
+        if kwargs.get("detached") and volume["State"] != "available":
+            continue
+        if types and volume.get("VolumeType") not in types:
+            continue
+        if root_devices is not None and not any(
+            attachment["Device"] in root_devices for attachment in attachments
+        ):
+            continue
+        yield volume if kwargs.get("detail") else volume["VolumeId"]
@@ -1,6 +1,7 @@
 import logging
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
 from avtomat_aws.helpers.set_session_objects import set_session_objects
@@ -14,6 +15,7 @@ RULES = [{"required": ["instance_id", "kms_key_id"]}]
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory(["instance", "volume", "snapshot"])
 def encrypt_instance_volumes(**kwargs):
     """Encrypt all instance volumes with a KMS key"""
 
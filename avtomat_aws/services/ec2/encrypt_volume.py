@@ -1,8 +1,10 @@
 import logging
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.set_resource import set_resource
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,7 @@ RULES = [{"required": ["volume_id", "kms_key_id"]}]
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory(["instance", "volume", "snapshot"])
 def encrypt_volume(**kwargs):
     """Encrypt an EBS volume with a KMS key"""
 
@@ -28,10 +31,14 @@ def encrypt_volume(**kwargs):
         region=kwargs["region"],
     )
 
-    logger.info(f"{volume_id} - encrypting with {kms_key_id}")
+    # A describe record may be stale, its state and attachments decide what is stopped and detached
+    volume = set_resource(
+        session_objects["ec2_resource"], "Volume", volume_id, "VolumeId"
+    )
+    volume_id = volume.id
+    volume.reload()
 
-    # Create snapshot
-    volume = session_objects["ec2_resource"].Volume(volume_id)
+    logger.info(f"{volume_id} - encrypting with {kms_key_id}")
 
     if not kwargs.get("re_encrypt") and volume.encrypted:
         logger.info(f"{volume_id} - skipped, already encrypted")
@@ -50,6 +57,7 @@ def encrypt_volume(**kwargs):
         if instance.state["Name"] == "running":
             originally_running = True
 
+    # Create snapshot
     snapshot = session_objects["ec2_resource"].create_snapshot(
         VolumeId=volume_id,
         Description=f"Pre-encryption snapshot of {volume_id}",
@@ -1,6 +1,7 @@
 import logging
 
 from avtomat_aws.decorators.authenticate import authenticate
+from avtomat_aws.decorators.invalidate_inventory import invalidate_inventory
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
 from avtomat_aws.helpers.format_tags import format_tags
@@ -25,6 +26,7 @@ RULES = [
 @validate(DEFAULTS, RULES)
 @set_logger()
 @authenticate()
+@invalidate_inventory()
 def modify_tags(**kwargs):
     """Create or delete tags for EC2 resources"""
 
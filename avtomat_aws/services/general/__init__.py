@@ -1 +1,7 @@
-from .get_date import get_date
+from avtomat_aws.helpers.lazy_actions import lazy_actions
+
+__all__ = [
+    "get_date",
+]
+
+lazy_actions(__name__)
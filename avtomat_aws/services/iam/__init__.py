@@ -1,12 +1,18 @@
-from .discover_inactive_console_users import discover_inactive_console_users
-from .discover_inactive_users import discover_inactive_users
-from .discover_no_mfa_users import discover_no_mfa_users
-from .discover_old_access_keys import discover_old_access_keys
-from .discover_old_password_users import discover_old_password_users
-from .discover_permissive_inline_policies import discover_permissive_inline_policies
-from .discover_permissive_policies import discover_permissive_policies
-from .discover_unused_access_keys import discover_unused_access_keys
-from .discover_unused_roles import discover_unused_roles
-from .modify_access_keys import modify_access_keys
-from .modify_users_console_access import modify_users_console_access
-from .quarantine_user import quarantine_user
+from avtomat_aws.helpers.lazy_actions import lazy_actions
+
+__all__ = [
+    "discover_inactive_console_users",
+    "discover_inactive_users",
+    "discover_no_mfa_users",
+    "discover_old_access_keys",
+    "discover_old_password_users",
+    "discover_permissive_inline_policies",
+    "discover_permissive_policies",
+    "discover_unused_access_keys",
+    "discover_unused_roles",
+    "modify_access_keys",
+    "modify_users_console_access",
+    "quarantine_user",
+]
+
+lazy_actions(__name__)
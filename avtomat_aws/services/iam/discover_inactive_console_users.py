@@ -6,7 +6,9 @@ from botocore.exceptions import ClientError
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.iam_users import fan_out_users
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import call_with_backoff
 
 logger = logging.getLogger(__name__)
 
@@ -31,48 +33,47 @@ def discover_inactive_console_users(**kwargs):
         f"Discovering users with last console sign-in over {threshold_days} days"
     )
 
-    users = []
-    users_response = session_objects["iam_client"].list_users(MaxItems=50)
-    while True:
-        for user in users_response["Users"]:
-            try:
-                password_last_used = (
-                    session_objects["iam_client"]
-                    .get_user(UserName=user["UserName"])["User"]
-                    .get("PasswordLastUsed")
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to get last console sign-in for {user['UserName']} - {e}"
-                )
-                continue
-            try:
-                console_access = session_objects["iam_client"].get_login_profile(
-                    UserName=user["UserName"]
-                )
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "NoSuchEntity":
-                    continue
-                else:
-                    logger.error(
-                        f"Failed to get console access status for {user['UserName']} - {e}"
-                    )
-                    continue
-
-            if password_last_used:
-                age = (datetime.now(timezone.utc) - password_last_used).days
-                if age > threshold_days:
-                    users.append({"UserName": user["UserName"]})
-            elif console_access.get("LoginProfile"):
-                users.append({"UserName": user["UserName"]})
-        if users_response["IsTruncated"]:
-            users_response = session_objects["iam_client"].list_users(
-                Marker=users_response["Marker"]
-            )
-        else:
-            break
+    iam_client = session_objects["iam_client"]
+
+    users = [
+        {"UserName": user["UserName"]}
+        for user, inactive in fan_out_users(
+            lambda user: check_console_inactive(user, threshold_days, iam_client),
+            iam_client,
+            kwargs.get("workers"),
+        )
+        if inactive
+    ]
 
     logger.info(f"{len(users)} users found")
     logger.debug(users)
 
     return users
+
+
+def check_console_inactive(user, threshold_days, iam_client):
+    """Check if a user with console access hasn't signed in within threshold days"""
+
+    try:
+        password_last_used = call_with_backoff(
+            iam_client.get_user, UserName=user["UserName"]
+        )["User"].get("PasswordLastUsed")
+    except Exception as e:
+        logger.error(f"Failed to get last console sign-in for {user['UserName']} - {e}")
+        return False
+    try:
+        console_access = call_with_backoff(
+            iam_client.get_login_profile, UserName=user["UserName"]
+        )
+    except ClientError as e:
+        # Users without console access
+        if e.response["Error"]["Code"] != "NoSuchEntity":
+            logger.error(
+                f"Failed to get console access status for {user['UserName']} - {e}"
+            )
+        return False
+
+    if password_last_used:
+        age = (datetime.now(timezone.utc) - password_last_used).days
+        return age > threshold_days
+    return bool(console_access.get("LoginProfile"))
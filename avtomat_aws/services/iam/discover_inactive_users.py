@@ -4,7 +4,9 @@ from datetime import datetime, timezone
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.iam_users import fan_out_users
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import call_with_backoff
 
 logger = logging.getLogger(__name__)
 
@@ -27,32 +29,28 @@ def discover_inactive_users(**kwargs):
 
     logger.info(f"Discovering users with last activity over {threshold_days} days")
 
-    users = []
-    users_response = session_objects["iam_client"].list_users(MaxItems=50)
-    while True:
-        for user in users_response["Users"]:
-            try:
-                access_keys_recently_used = check_access_keys_recently_used(
-                    user, threshold_days, session_objects
-                )
-                password_recently_used = check_password_recently_used(
-                    user, threshold_days, session_objects
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to check user activity for {user['UserName']} - {e}"
-                )
-                continue
-
-            if not access_keys_recently_used and not password_recently_used:
-                users.append({"UserName": user["UserName"]})
-
-        if users_response["IsTruncated"]:
-            users_response = session_objects["iam_client"].list_users(
-                Marker=users_response["Marker"]
+    iam_client = session_objects["iam_client"]
+
+    def is_inactive(user):
+        try:
+            access_keys_recently_used = check_access_keys_recently_used(
+                user, threshold_days, session_objects
+            )
+            password_recently_used = check_password_recently_used(
+                user, threshold_days, session_objects
             )
-        else:
-            break
+        except Exception as e:
+            logger.error(f"Failed to check user activity for {user['UserName']} - {e}")
+            return False
+        return not access_keys_recently_used and not password_recently_used
+
+    users = [
+        {"UserName": user["UserName"]}
+        for user, inactive in fan_out_users(
+            is_inactive, iam_client, kwargs.get("workers")
+        )
+        if inactive
+    ]
 
     logger.info(f"{len(users)} users found")
     logger.debug(users)
@@ -63,13 +61,14 @@ def discover_inactive_users(**kwargs):
 def check_access_keys_recently_used(user, threshold_days, session_objects):
     """Check if user has used any access keys within the threshold days"""
 
-    keys_response = session_objects["iam_client"].list_access_keys(
-        UserName=user["UserName"]
+    keys_response = call_with_backoff(
+        session_objects["iam_client"].list_access_keys, UserName=user["UserName"]
     )
 
     for key in keys_response["AccessKeyMetadata"]:
-        last_used = session_objects["iam_client"].get_access_key_last_used(
-            AccessKeyId=key["AccessKeyId"]
+        last_used = call_with_backoff(
+            session_objects["iam_client"].get_access_key_last_used,
+            AccessKeyId=key["AccessKeyId"],
         )
 
         if "LastUsedDate" in last_used["AccessKeyLastUsed"]:
@@ -86,11 +85,9 @@ def check_access_keys_recently_used(user, threshold_days, session_objects):
 def check_password_recently_used(user, threshold_days, session_objects):
     """Check if user has used their password within the threshold days"""
 
-    password_last_used = (
-        session_objects["iam_client"]
-        .get_user(UserName=user["UserName"])["User"]
-        .get("PasswordLastUsed")
-    )
+    password_last_used = call_with_backoff(
+        session_objects["iam_client"].get_user, UserName=user["UserName"]
+    )["User"].get("PasswordLastUsed")
 
     if password_last_used:
         age = (datetime.now(timezone.utc) - password_last_used).days
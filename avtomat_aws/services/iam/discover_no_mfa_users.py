@@ -3,7 +3,9 @@ import logging
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.iam_users import fan_out_users
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import call_with_backoff
 
 logger = logging.getLogger(__name__)
 
@@ -22,27 +24,33 @@ def discover_no_mfa_users(**kwargs):
 
     logger.info(f"Discovering users without MFA enabled")
 
-    users = []
-    users_response = session_objects["iam_client"].list_users(MaxItems=50)
-    while True:
-        for user in users_response["Users"]:
-            try:
-                mfa_response = session_objects["iam_client"].list_mfa_devices(
-                    UserName=user["UserName"]
-                )
-            except Exception as e:
-                logger.error(f"Failed to list MFA devices for {user['UserName']} - {e}")
-                continue
-            if not mfa_response["MFADevices"]:
-                users.append({"UserName": user["UserName"]})
-        if users_response["IsTruncated"]:
-            users_response = session_objects["iam_client"].list_users(
-                Marker=users_response["Marker"]
-            )
-        else:
-            break
+    iam_client = session_objects["iam_client"]
+
+    users = [
+        {"UserName": user["UserName"]}
+        for user, no_mfa in fan_out_users(
+            lambda user: check_no_mfa(user, iam_client),
+            iam_client,
+            kwargs.get("workers"),
+        )
+        if no_mfa
+    ]
 
     logger.info(f"{len(users)} users found")
     logger.debug(users)
 
     return users
+
+
+def check_no_mfa(user, iam_client):
+    """Check if a user has no MFA devices"""
+
+    try:
+        mfa_response = call_with_backoff(
+            iam_client.list_mfa_devices, UserName=user["UserName"]
+        )
+    except Exception as e:
+        logger.error(f"Failed to list MFA devices for {user['UserName']} - {e}")
+        return False
+
+    return not mfa_response["MFADevices"]
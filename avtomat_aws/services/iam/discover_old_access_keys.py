@@ -4,7 +4,9 @@ from datetime import datetime, timezone
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.iam_users import fan_out_users
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import call_with_backoff
 
 logger = logging.getLogger(__name__)
 
@@ -27,35 +29,42 @@ def discover_old_access_keys(**kwargs):
 
     logger.info(f"Discovering access keys over {threshold_days} days old")
 
-    access_keys = []
-    users_response = session_objects["iam_client"].list_users(MaxItems=50)
-    while True:
-        for user in users_response["Users"]:
-            try:
-                keys_response = session_objects["iam_client"].list_access_keys(
-                    UserName=user["UserName"]
-                )
-            except Exception as e:
-                logger.error(f"Failed to list access keys for {user['UserName']} - {e}")
-                continue
-            for key in keys_response["AccessKeyMetadata"]:
-                if key["Status"] == "Active":
-                    age = (datetime.now(timezone.utc) - key["CreateDate"]).days
-                    if age > threshold_days:
-                        access_keys.append(
-                            {
-                                "UserName": user["UserName"],
-                                "AccessKeyId": key["AccessKeyId"],
-                            }
-                        )
-        if users_response["IsTruncated"]:
-            users_response = session_objects["iam_client"].list_users(
-                Marker=users_response["Marker"]
-            )
-        else:
-            break
+    iam_client = session_objects["iam_client"]
+
+    access_keys = [
+        access_key
+        for user, user_access_keys in fan_out_users(
+            lambda user: check_access_keys(user, threshold_days, iam_client),
+            iam_client,
+            kwargs.get("workers"),
+        )
+        for access_key in user_access_keys
+    ]
 
     logger.info(f"{len(access_keys)} access keys found")
     logger.debug(access_keys)
 
     return access_keys
+
+
+def check_access_keys(user, threshold_days, iam_client):
+    """Return active access keys of a user created more than threshold days ago"""
+
+    try:
+        keys_response = call_with_backoff(
+            iam_client.list_access_keys, UserName=user["UserName"]
+        )
+    except Exception as e:
+        logger.error(f"Failed to list access keys for {user['UserName']} - {e}")
+        return []
+
+    access_keys = []
+    for key in keys_response["AccessKeyMetadata"]:
+        if key["Status"] == "Active":
+            age = (datetime.now(timezone.utc) - key["CreateDate"]).days
+            if age > threshold_days:
+                access_keys.append(
+                    {"UserName": user["UserName"], "AccessKeyId": key["AccessKeyId"]}
+                )
+
+    return access_keys
@@ -6,7 +6,9 @@ from botocore.exceptions import ClientError
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.iam_users import fan_out_users
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import call_with_backoff
 
 logger = logging.getLogger(__name__)
 
@@ -26,33 +28,38 @@ def discover_old_password_users(threshold_days, **kwargs):
 
     logger.info(f"Discovering users with passwords over {threshold_days} days old")
 
-    users = []
-    users_response = session_objects["iam_client"].list_users(MaxItems=50)
-    while True:
-        for user in users_response["Users"]:
-            try:
-                password_create_date = session_objects["iam_client"].get_login_profile(
-                    UserName=user["UserName"]
-                )["LoginProfile"]["CreateDate"]
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "NoSuchEntity":
-                    continue
-                else:
-                    logger.error(
-                        f"Failed to get password create date for {user['UserName']} - {e}"
-                    )
-                    continue
-            age = (datetime.now(timezone.utc) - password_create_date).days
-            if age > threshold_days:
-                users.append({"UserName": user["UserName"]})
-        if users_response["IsTruncated"]:
-            users_response = session_objects["iam_client"].list_users(
-                Marker=users_response["Marker"]
-            )
-        else:
-            break
+    iam_client = session_objects["iam_client"]
+
+    users = [
+        {"UserName": user["UserName"]}
+        for user, old_password in fan_out_users(
+            lambda user: check_password_age(user, threshold_days, iam_client),
+            iam_client,
+            kwargs.get("workers"),
+        )
+        if old_password
+    ]
 
     logger.info(f"{len(users)} users found")
     logger.debug(users)
 
     return users
+
+
+def check_password_age(user, threshold_days, iam_client):
+    """Check if a user has a password older than threshold days"""
+
+    try:
+        password_create_date = call_with_backoff(
+            iam_client.get_login_profile, UserName=user["UserName"]
+        )["LoginProfile"]["CreateDate"]
+    except ClientError as e:
+        # Users without a password
+        if e.response["Error"]["Code"] != "NoSuchEntity":
+            logger.error(
+                f"Failed to get password create date for {user['UserName']} - {e}"
+            )
+        return False
+
+    age = (datetime.now(timezone.utc) - password_create_date).days
+    return age > threshold_days
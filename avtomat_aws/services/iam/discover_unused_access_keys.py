@@ -4,11 +4,13 @@ from datetime import datetime, timezone
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.iam_users import fan_out_users
 from avtomat_aws.helpers.set_session_objects import set_session_objects
+from avtomat_aws.helpers.throttle import call_with_backoff
 
 logger = logging.getLogger(__name__)
 
-DEFAULTS = {"region": None, "debug": False, "silent": False}
+DEFAULTS = {"stream": False, "region": None, "debug": False, "silent": False}
 RULES = [{"required": ["threshold_days"]}]
 
 
@@ -27,48 +29,65 @@ def discover_unused_access_keys(**kwargs):
 
     logger.info(f"Discovering access keys not used for more than {threshold_days} days")
 
-    access_keys = []
-    users_response = session_objects["iam_client"].list_users(MaxItems=50)
-    while True:
-        for user in users_response["Users"]:
-            try:
-                keys_response = session_objects["iam_client"].list_access_keys(
-                    UserName=user["UserName"]
-                )
-            except Exception as e:
-                logger.error(f"Failed to list access keys for {user['UserName']} - {e}")
-                continue
-            for key in keys_response["AccessKeyMetadata"]:
-                if key["Status"] == "Active":
-                    try:
-                        last_used = session_objects[
-                            "iam_client"
-                        ].get_access_key_last_used(AccessKeyId=key["AccessKeyId"])
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to get last used date for {key['AccessKeyId']} - {e}"
-                        )
-                        continue
-                    if "AccessKeyLastUsed" in last_used:
-                        age = (
-                            datetime.now(timezone.utc)
-                            - last_used["AccessKeyLastUsed"]["LastUsedDate"]
-                        ).days
-                        if age > threshold_days:
-                            access_keys.append(
-                                {
-                                    "UserName": user["UserName"],
-                                    "AccessKeyId": key["AccessKeyId"],
-                                }
-                            )
-        if users_response["IsTruncated"]:
-            users_response = session_objects["iam_client"].list_users(
-                Marker=users_response["Marker"]
-            )
-        else:
-            break
+    access_keys = search_access_keys(
+        threshold_days, session_objects, kwargs.get("workers")
+    )
+
+    if kwargs.get("stream"):
+        logger.info("Streaming access keys")
+        return access_keys
+
+    access_keys = list(access_keys)
 
     logger.info(f"{len(access_keys)} access keys found")
     logger.debug(access_keys)
 
     return access_keys
+
+
+def search_access_keys(threshold_days, session_objects, workers=None):
+    """Search for active access keys last used more than threshold days ago"""
+
+    iam_client = session_objects["iam_client"]
+
+    # Keys are yielded per user as checks complete, in list_users order
+    for user, access_keys in fan_out_users(
+        lambda user: check_access_keys(user, threshold_days, iam_client),
+        iam_client,
+        workers,
+    ):
+        yield from access_keys
+
+
+def check_access_keys(user, threshold_days, iam_client):
+    """Return active access keys of a user last used more than threshold days ago"""
+
+    try:
+        keys_response = call_with_backoff(
+            iam_client.list_access_keys, UserName=user["UserName"]
+        )
+    except Exception as e:
+        logger.error(f"Failed to list access keys for {user['UserName']} - {e}")
+        return []
+
+    access_keys = []
+    for key in keys_response["AccessKeyMetadata"]:
+        if key["Status"] != "Active":
+            continue
+        try:
+            last_used = call_with_backoff(
+                iam_client.get_access_key_last_used, AccessKeyId=key["AccessKeyId"]
+            )
+        except Exception as e:
+            logger.error(f"Failed to get last used date for {key['AccessKeyId']} - {e}")
+            continue
+        last_used_date = last_used.get("AccessKeyLastUsed", {}).get("LastUsedDate")
+        if not last_used_date:
+            continue
+        age = (datetime.now(timezone.utc) - last_used_date).days
+        if age > threshold_days:
+            access_keys.append(
+                {"UserName": user["UserName"], "AccessKeyId": key["AccessKeyId"]}
+            )
+
+    return access_keys
@@ -1,3 +1,9 @@
-from .create_objects import create_objects
-from .delete_objects import delete_objects
-from .discover_objects import discover_objects
+from avtomat_aws.helpers.lazy_actions import lazy_actions
+
+__all__ = [
+    "create_objects",
+    "delete_objects",
+    "discover_objects",
+]
+
+lazy_actions(__name__)
@@ -4,6 +4,8 @@ from datetime import datetime, timezone
 from avtomat_aws.decorators.authenticate import authenticate
 from avtomat_aws.decorators.set_logger import set_logger
 from avtomat_aws.decorators.validate import validate
+from avtomat_aws.helpers.paginate import paginate_pages
+from avtomat_aws.helpers.prefetch import prefetch
 from avtomat_aws.helpers.set_session_objects import set_session_objects
 
 logger = logging.getLogger(__name__)
@@ -13,6 +15,8 @@ DEFAULTS = {
     "modified_before": None,
     "modified_after": None,
     "name_only": False,
+    "stream": False,
+    "prefetch": 0,
     "region": None,
     "debug": False,
     "silent": False,
@@ -42,7 +46,7 @@ def discover_objects(**kwargs):
         ).replace(tzinfo=timezone.utc)
 
     session_objects = set_session_objects(
-        kwargs["session"], resources=["s3"], region=kwargs["region"]
+        kwargs["session"], clients=["s3"], region=kwargs["region"]
     )
 
     if kwargs.get("prefix"):
@@ -52,12 +56,23 @@ def discover_objects(**kwargs):
     else:
         logger.info(f"Discovering objects in '{bucket}'")
 
-    response = (
-        session_objects["s3_resource"]
-        .Bucket(bucket)
-        .objects.filter(Prefix=kwargs["prefix"])
+    # Clients are thread-safe, unlike resources, so pages can be fetched on the prefetch thread
+    pages = paginate_pages(
+        session_objects["s3_client"],
+        "list_objects_v2",
+        Bucket=bucket,
+        Prefix=kwargs["prefix"],
     )
-    objects = filter_objects(response, **kwargs)
+    pages = prefetch(pages, kwargs.get("prefetch"), label="Objects")
+    objects = filter_objects(
+        (obj for page in pages for obj in page.get("Contents") or []), **kwargs
+    )
+
+    if kwargs.get("stream"):
+        logger.info("Streaming objects")
+        return objects
+
+    objects = list(objects)
 
     logger.info(f"{len(objects)} objects found")
     logger.debug(objects)
@@ -71,22 +86,22 @@ def filter_objects(response, **kwargs):
     filtered_objects = response
 
     if kwargs.get("modified_before"):
-        filtered_objects = [
+        filtered_objects = (
             obj
             for obj in filtered_objects
-            if obj.last_modified < kwargs["modified_before"]
-        ]
+            if obj["LastModified"] < kwargs["modified_before"]
+        )
 
     if kwargs.get("modified_after"):
-        filtered_objects = [
+        filtered_objects = (
             obj
             for obj in filtered_objects
-            if obj.last_modified > kwargs["modified_after"]
-        ]
+            if obj["LastModified"] > kwargs["modified_after"]
+        )
 
     if kwargs.get("name_only"):
-        filtered_objects = [obj.key.split("/")[-1] for obj in filtered_objects]
+        filtered_objects = (obj["Key"].split("/")[-1] for obj in filtered_objects)
     else:
-        filtered_objects = [obj.key for obj in filtered_objects]
+        filtered_objects = (obj["Key"] for obj in filtered_objects)
 
     return filtered_objects
@@ -1,2 +1,8 @@
-from .create_session import create_session
-from .whoami import whoami
+from avtomat_aws.helpers.lazy_actions import lazy_actions
+
+__all__ = [
+    "create_session",
+    "whoami",
+]
+
+lazy_actions(__name__)
@@ -0,0 +1,140 @@
+"""Compare snapshot discovery on raw client pages with the boto3 resource collection it replaced.
+
+API calls are answered by a botocore Stubber, so only the per item cost is measured.
+
+usage: python benchmarks/discovery.py [--snapshots N]
+"""
+
+import argparse
+import datetime
+import time
+import tracemalloc
+from importlib import import_module
+
+import boto3
+from botocore.stub import Stubber
+
+PAGE_SIZE = 1000
+CREATED_AFTER = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def make_pages(count):
+    """Return describe_snapshots responses, every tenth snapshot made by AWS Backup."""
+
+    snapshots = []
+    for n in range(count):
+        tags = [{"Key": "Name", "Value": f"snapshot-{n}"}]
+        if n % 10 == 0:
+            tags.append({"Key": "aws:backup:source-resource", "Value": "vol"})
+        snapshots.append(
+            {
+                "SnapshotId": f"snap-{n:017x}",
+                "VolumeId": f"vol-{n:017x}",
+                "State": "completed",
+                "StartTime": CREATED_AFTER + datetime.timedelta(minutes=n),
+                "VolumeSize": 8,
+                "Encrypted": True,
+                "OwnerId": "123456789012",
+                "Tags": tags,
+            }
+        )
+
+    pages = []
+    for start in range(0, count, PAGE_SIZE):
+        page = {"Snapshots": snapshots[start : start + PAGE_SIZE]}
+        if start + PAGE_SIZE < count:
+            page["NextToken"] = str(start + PAGE_SIZE)
+        pages.append(page)
+    return pages
+
+
+def resource_path(resource):
+    """Discover snapshots the way discover_snapshots did, through resource objects."""
+
+    response = resource.snapshots.filter(Filters=[], OwnerIds=["self"]).page_size(
+        PAGE_SIZE
+    )
+    return [
+        snapshot.id
+        for snapshot in response
+        if snapshot.start_time >= CREATED_AFTER
+        and not any(
+            tag["Key"].startswith("aws:backup") for tag in (snapshot.tags or [])
+        )
+    ]
+
+
+def client_path(session):
+    """Discover snapshots with discover_snapshots' search on raw client pages."""
+
+    module = import_module("avtomat_aws.services.ec2.discover_snapshots")
+    return list(
+        module.search_snapshots(
+            [],
+            session=session,
+            region="us-east-1",
+            snapshot_ids=[],
+            created_after=CREATED_AFTER.replace(tzinfo=None),
+            exclude_aws_backup=True,
+        )
+    )
+
+
+def measure(discover, client, pages):
+    """Run a discovery twice, return its time, peak traced memory and the number found."""
+
+    def stub():
+        # Stubbed responses are validated when added, so it's kept out of the measurement
+        stubber = Stubber(client)
+        for page in pages:
+            stubber.add_response("describe_snapshots", page)
+        return stubber
+
+    with stub():
+        start = time.perf_counter()
+        found = len(discover())
+        elapsed = time.perf_counter() - start
+
+    # Tracing slows allocation down, so memory is measured on a separate run
+    with stub():
+        tracemalloc.start()
+        discover()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return elapsed, peak / 1024 / 1024, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discovery path benchmark")
+    parser.add_argument(
+        "--snapshots", type=int, default=100_000, help="Snapshots to discover."
+    )
+    args = parser.parse_args()
+
+    from avtomat_aws.helpers.set_session_objects import config, get_pooled
+
+    session = boto3.Session(
+        aws_access_key_id="benchmark",
+        aws_secret_access_key="benchmark",
+        region_name="us-east-1",
+    )
+    resource = get_pooled(session, "resource", "ec2", "us-east-1", config)
+    client = get_pooled(session, "client", "ec2", "us-east-1", config)
+    pages = make_pages(args.snapshots)
+
+    results = {
+        "resource": measure(
+            lambda: resource_path(resource), resource.meta.client, pages
+        ),
+        "client": measure(lambda: client_path(session), client, pages),
+    }
+
+    print(f"{args.snapshots} snapshots")
+    print(f"{'path':<10} {'time (s)':>10} {'peak memory (MiB)':>18} {'found':>8}")
+    for path, (elapsed, peak, found) in results.items():
+        print(f"{path:<10} {elapsed:>10.2f} {peak:>18.1f} {found:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measure `aaws` cold-start time and import cost per command.
+
+usage: python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = [
+    ["--version"],
+    ["--help"],
+    ["ec2", "--help"],
+    ["ec2", "discover_instances", "--help"],
+    ["ec2", "discover_instances", "--invalid"],
+    ["iam", "quarantine_user", "--help"],
+    ["ec2", "invalid_action"],
+]
+
+
+def run(command):
+    """Run a command once, return its wall time, import time and whether boto3 was imported."""
+
+    start = time.perf_counter()
+    process = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-m", "avtomat_aws.cli.main", *command],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    # -X importtime lines: "import time: self [us] | cumulative | imported package",
+    # nested imports are indented under the package that triggered them
+    imports = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imports.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+    outermost = min(indent for indent, _, _ in imports)
+    total = sum(cumulative for indent, _, cumulative in imports if indent == outermost)
+    names = {name for _, name, _ in imports}
+
+    return elapsed, total / 1_000_000, "boto3" in names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="aaws startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command.")
+    args = parser.parse_args()
+
+    print(f"{'command':<45} {'wall (ms)':>10} {'imports (ms)':>13} {'boto3':>6}")
+    for command in COMMANDS:
+        samples = [run(command) for _ in range(args.runs)]
+        wall = statistics.median(sample[0] for sample in samples) * 1000
+        imports = statistics.median(sample[1] for sample in samples) * 1000
+        boto3 = "yes" if any(sample[2] for sample in samples) else "no"
+        print(f"{' '.join(command):<45} {wall:>10.1f} {imports:>13.1f} {boto3:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare the streaming table renderer with the list based one.
+
+usage: python benchmarks/table.py [--rows N]
+"""
+
+import argparse
+import contextlib
+import os
+import time
+import tracemalloc
+
+from avtomat_aws.helpers.cli.table import stream_table
+
+
+def table_from_list_dict_data(data):
+    """Print a table from a list of dictionaries, the list based renderer the CLI used before streaming."""
+
+    headers = sorted(
+        set(key for item in data for key in item.keys())
+    )  # Sort headers for consistent ordering
+    column_widths = {
+        header: max(len(header), max(len(str(item.get(header, ""))) for item in data))
+        for header in headers
+    }
+
+    # Print table header
+    header_row = (
+        "+" + "+".join(["-" * (column_widths[header] + 2) for header in headers]) + "+"
+    )
+    print(header_row)
+    header_content = "|".join(
+        [" " + header.ljust(column_widths[header]) + " " for header in headers]
+    )
+    print(f"|{header_content}|")
+    print(header_row.replace("-", "-"))
+
+    # Print each row of data without dividers between rows
+    for item in data:
+        row_data = [
+            " " + str(item.get(header, "")).ljust(column_widths[header]) + " "
+            for header in headers
+        ]
+        print(f"|{'|'.join(row_data)}|")
+
+
+def make_rows(count):
+    """Yield instance-like rows."""
+
+    for n in range(count):
+        yield {
+            "InstanceId": f"i-{n:017x}",
+            "State": "running" if n % 3 else "stopped",
+            "Name": f"web-server-{n % 97}",
+            "PrivateIpAddress": f"10.{n % 256}.{n // 256 % 256}.{n % 251}",
+        }
+
+
+def measure(render):
+    """Run a renderer with output discarded, return its time and peak traced memory."""
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        render()
+        elapsed = time.perf_counter() - start
+
+        # Tracing slows allocation down, so memory is measured on a separate run
+        tracemalloc.start()
+        render()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Table rendering benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows to render.")
+    args = parser.parse_args()
+
+    # The list based renderer needs every row in memory before it can start
+    results = {
+        "list": measure(lambda: table_from_list_dict_data(list(make_rows(args.rows)))),
+        "stream": measure(lambda: stream_table(make_rows(args.rows))),
+    }
+
+    print(f"{args.rows} rows")
+    print(f"{'renderer':<10} {'time (s)':>10} {'peak memory (MiB)':>18}")
+    for renderer, (elapsed, peak) in results.items():
+        print(f"{renderer:<10} {elapsed:>10.2f} {peak:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare the compiled tag predicate with the per resource matching loop it replaced.
+
+usage: python benchmarks/tag_matching.py [--resources N]
+"""
+
+import argparse
+import time
+
+from avtomat_aws.helpers.format_tags import format_tags
+from avtomat_aws.helpers.tag_predicate import compile_tags
+
+TAGS = ["Environment=production", "Owner", "CostCenter=1234", "Backup=daily"]
+
+
+def make_tag_lists(count):
+    """Return snapshot-like tag lists, every tenth one compliant."""
+
+    tag_lists = []
+    for n in range(count):
+        tags = [
+            {"Key": "Name", "Value": f"snapshot-{n}"},
+            {"Key": "Environment", "Value": "production" if n % 2 else "staging"},
+            {"Key": "CostCenter", "Value": "1234"},
+            {"Key": "CreatedBy", "Value": "backup-job"},
+        ]
+        if n % 5 == 0:
+            tags += [
+                {"Key": "Owner", "Value": "ops"},
+                {"Key": "Backup", "Value": "daily"},
+            ]
+        tag_lists.append(tags)
+    return tag_lists
+
+
+def loop_match(tag_lists, tags):
+    """Match tags the way discover_tags used to, a dictionary and 'all' per resource."""
+
+    matched = 0
+    for tag_list in tag_lists:
+        resource_tags = {tag["Key"]: tag.get("Value", None) for tag in tag_list or []}
+        if all(
+            tag["Key"] in resource_tags
+            and (tag.get("Value") is None or resource_tags[tag["Key"]] == tag["Value"])
+            for tag in tags
+        ):
+            matched += 1
+    return matched
+
+
+def compiled_match(tag_lists, tags):
+    """Match tags with a predicate compiled once."""
+
+    has_tags = compile_tags(tags)
+    return len(list(filter(has_tags, tag_lists)))
+
+
+def measure(match, tag_lists, tags):
+    """Return the best time of a few runs and the number of matches."""
+
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        matched = match(tag_lists, tags)
+        timings.append(time.perf_counter() - start)
+    return min(timings), matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tag matching benchmark")
+    parser.add_argument(
+        "--resources", type=int, default=200_000, help="Tag lists to match."
+    )
+    args = parser.parse_args()
+
+    tag_lists = make_tag_lists(args.resources)
+    tags = format_tags(TAGS)
+    results = {
+        "loop": measure(loop_match, tag_lists, tags),
+        "compiled": measure(compiled_match, tag_lists, tags),
+    }
+
+    print(f"{args.resources} resources, tags: {' '.join(TAGS)}")
+    print(f"{'matcher':<10} {'time (ms)':>10} {'matched':>10}")
+    for matcher, (elapsed, matched) in results.items():
+        print(f"{matcher:<10} {elapsed * 1000:>10.1f} {matched:>10}")
+
+
+if __name__ == "__main__":
+    main()